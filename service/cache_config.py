@@ -4,36 +4,52 @@ from __future__ import annotations
 
 import tomllib
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
+_DEFAULT_PATH = Path(__file__).resolve().parent.parent / "cache_config.toml"
 
-@dataclass(slots=True)
+
+@dataclass(slots=True, frozen=True)
 class CacheConfig:
     """Cache configuration.
 
-    ``max_loaded_images`` limits full-size images in memory and
-    ``max_loaded_previews`` limits the number of cached previews. ``0``
+    ``max_loaded_images`` limits full-size images in memory,
+    ``max_loaded_previews`` limits the number of cached previews and
+    ``max_disk_previews`` the number of previews kept on disk. ``0``
     disables the respective limit.
     """
 
     max_loaded_images: int = 0
     max_loaded_previews: int = 0
+    max_disk_previews: int = 2000
+
+
+# Shared instance for the common "default limits" case
+_DEFAULT = CacheConfig()
 
 
+@lru_cache(maxsize=1)
 def load_cache_config(path: Path | None = None) -> CacheConfig:
-    """Load cache configuration from ``cache_config.toml``."""
+    """Load cache configuration from ``cache_config.toml``.
+
+    The result is cached, so the file is parsed once per process. The
+    returned config is frozen because it is shared between callers.
+    """
 
-    config_path = path or Path(__file__).resolve().parent.parent / "cache_config.toml"
+    config_path = path or _DEFAULT_PATH
     if not config_path.exists():
-        return CacheConfig()
+        return _DEFAULT
 
     try:
         with config_path.open("rb") as f:
             data = tomllib.load(f)
     except Exception:
-        return CacheConfig()
+        return _DEFAULT
 
-    return CacheConfig(
+    config = CacheConfig(
         max_loaded_images=int(data.get("max_loaded_images", 0)),
         max_loaded_previews=int(data.get("max_loaded_previews", 0)),
+        max_disk_previews=int(data.get("max_disk_previews", _DEFAULT.max_disk_previews)),
     )
+    return _DEFAULT if config == _DEFAULT else config
@@ -3,12 +3,32 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, dataclass, field
+import operator
+import os
+import struct
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Sequence
+from typing import Any, cast
 
 from PIL import ExifTags, Image
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, see requirements-fast.txt
+    HAS_ORJSON = False
+else:
+    HAS_ORJSON = True
+
+try:
+    import numpy as np
+except ImportError:  # Optional speedup, see requirements-fast.txt
+    HAS_NUMPY = False
+else:
+    HAS_NUMPY = True
+
 
 @dataclass(slots=True)
 class NumericCondition:
@@ -18,9 +38,100 @@ class NumericCondition:
     value: float
 
 
+def _numeric_condition(data: Mapping[str, Any], key: str) -> NumericCondition | None:
+    val = data.get(key)
+    return NumericCondition(**val) if isinstance(val, dict) else None
+
+
+_COMPARATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+}
+
+
+def _orientation(width: int, height: int) -> str:
+    return "square" if width == height else ("landscape" if width > height else "portrait")
+
+
+@dataclass(slots=True)
+class ImageContext:
+    """Image properties that profile conditions are evaluated against."""
+
+    smallest_side: int
+    largest_side: int
+    pixels: int
+    aspect_ratio: float
+    orientation: str
+    image_format_upper: str | None = None
+    has_transparency: bool | None = None
+    file_size: int | None = None
+    # Either the tags or a function that reads them on first use
+    exif: dict[str, Any] | Callable[[], dict[str, Any]] | None = None
+
+    def get_exif(self) -> dict[str, Any] | None:
+        """Return the EXIF tags, reading them first if only a loader was given."""
+        if callable(self.exif):
+            self.exif = self.exif()
+        return self.exif
+
+    @classmethod
+    def from_size(
+        cls,
+        width: int,
+        height: int,
+        *,
+        image_format: str | None = None,
+        has_transparency: bool | None = None,
+        file_size: int | None = None,
+        exif: dict[str, Any] | Callable[[], dict[str, Any]] | None = None,
+    ) -> ImageContext:
+        return cls(
+            smallest_side=min(width, height),
+            largest_side=max(width, height),
+            pixels=width * height,
+            aspect_ratio=width / height,
+            orientation=_orientation(width, height),
+            image_format_upper=image_format.upper() if image_format is not None else None,
+            has_transparency=has_transparency,
+            file_size=file_size,
+            exif=exif,
+        )
+
+
+_Check = tuple[str, Callable[[ImageContext], bool]]
+
+# Order in which matches() runs the checks: single comparisons first, the EXIF walk last
+_MATCH_ORDER = (
+    "orientation",
+    "input_formats",
+    "requires_transparency",
+    "smallest_side",
+    "largest_side",
+    "pixel_count",
+    "aspect_ratio",
+    "file_size",
+    "required_exif",
+)
+
+
+class _CompiledChecks:
+    # The compiled checks live in a slot of their own so that they are not a
+    # dataclass field and never end up in asdict() output or comparisons
+    __slots__ = ("_plan",)
+
+    _plan: tuple[tuple[_Check, ...], tuple[_Check, ...]] | None
+
+
 @dataclass(slots=True)
-class ProfileConditions:
-    """Conditions for selecting a compression profile."""
+class ProfileConditions(_CompiledChecks):
+    """Conditions for selecting a compression profile.
+
+    The active conditions are compiled into a list of checks on first use.
+    Assigning a field recompiles them; fields should not be modified in place.
+    """
 
     smallest_side: NumericCondition | None = None
     largest_side: NumericCondition | None = None
@@ -32,19 +143,71 @@ class ProfileConditions:
     file_size: NumericCondition | None = None
     required_exif: dict[str, Any] | None = None
 
-    @staticmethod
-    def _match(cond: NumericCondition | None, actual: float | None) -> bool:
-        if cond is None:
-            return True
-        if actual is None:
-            return False
-        return {
-            "<": actual < cond.value,
-            "<=": actual <= cond.value,
-            ">": actual > cond.value,
-            ">=": actual >= cond.value,
-            "==": actual == cond.value,
-        }.get(cond.op, False)
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name != "_plan":
+            object.__setattr__(self, "_plan", None)
+
+    def __getstate__(self) -> tuple[None, dict[str, Any]]:
+        # The compiled checks are closures that cannot be pickled; they are rebuilt on first use
+        return None, {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def _compile(self) -> list[_Check]:
+        """Return a check for every active condition, in declaration order."""
+
+        def numeric(cond: NumericCondition, attr: str) -> Callable[[ImageContext], bool]:
+            # The comparator and bound are picked here, not on every call
+            compare = _COMPARATORS.get(cond.op)
+            if compare is None:
+                return lambda _ctx: False
+            get = operator.attrgetter(attr)
+            value = cond.value
+            return lambda ctx: (actual := get(ctx)) is not None and compare(actual, value)
+
+        checks: list[_Check] = []
+        for name, attr in (
+            ("smallest_side", "smallest_side"),
+            ("largest_side", "largest_side"),
+            ("pixel_count", "pixels"),
+            ("aspect_ratio", "aspect_ratio"),
+        ):
+            cond = getattr(self, name)
+            if cond is not None:
+                checks.append((name, numeric(cond, attr)))
+        if (orientation := self.orientation) is not None:
+            checks.append(("orientation", lambda ctx: ctx.orientation == orientation))
+        if self.input_formats is not None:
+            formats = frozenset(f.upper() for f in self.input_formats)
+            checks.append(
+                ("input_formats", lambda ctx: ctx.image_format_upper is not None and ctx.image_format_upper in formats)
+            )
+        if (transparency := self.requires_transparency) is not None:
+            checks.append(
+                (
+                    "requires_transparency",
+                    lambda ctx: ctx.has_transparency is not None and ctx.has_transparency == transparency,
+                )
+            )
+        if self.file_size is not None:
+            checks.append(("file_size", numeric(self.file_size, "file_size")))
+        if self.required_exif:
+            required = tuple(self.required_exif.items())
+            checks.append(
+                (
+                    "required_exif",
+                    lambda ctx: (exif := ctx.get_exif()) is not None and all(exif.get(k) == v for k, v in required),
+                )
+            )
+        return checks
+
+    def _checks(self) -> tuple[tuple[_Check, ...], tuple[_Check, ...]]:
+        """Return the compiled checks in evaluation and in matching order."""
+        plan = self._plan
+        if plan is None:
+            checks = self._compile()
+            plan = (tuple(checks), tuple(sorted(checks, key=lambda check: _MATCH_ORDER.index(check[0]))))
+            self._plan = plan
+        return plan
 
     def evaluate(
         self,
@@ -57,36 +220,20 @@ class ProfileConditions:
         exif: dict[str, Any] | None = None,
     ) -> dict[str, bool]:
         """Return evaluation results for all active conditions."""
-        smallest_side = min(width, height)
-        largest_side = max(width, height)
-        pixels = width * height
-        aspect_ratio = width / height
-        orientation = "square" if width == height else ("landscape" if width > height else "portrait")
-
-        results: dict[str, bool] = {}
-        if self.smallest_side is not None:
-            results["smallest_side"] = self._match(self.smallest_side, smallest_side)
-        if self.largest_side is not None:
-            results["largest_side"] = self._match(self.largest_side, largest_side)
-        if self.pixel_count is not None:
-            results["pixel_count"] = self._match(self.pixel_count, pixels)
-        if self.aspect_ratio is not None:
-            results["aspect_ratio"] = self._match(self.aspect_ratio, aspect_ratio)
-        if self.orientation is not None:
-            results["orientation"] = orientation == self.orientation
-        if self.input_formats is not None:
-            results["input_formats"] = image_format is not None and image_format.upper() in [
-                f.upper() for f in self.input_formats
-            ]
-        if self.requires_transparency is not None:
-            results["requires_transparency"] = (
-                has_transparency is not None and has_transparency == self.requires_transparency
+        return self.evaluate_precomputed(
+            ImageContext.from_size(
+                width,
+                height,
+                image_format=image_format,
+                has_transparency=has_transparency,
+                file_size=file_size,
+                exif=exif,
             )
-        if self.file_size is not None:
-            results["file_size"] = self._match(self.file_size, file_size)
-        if self.required_exif:
-            results["required_exif"] = exif is not None and all(exif.get(k) == v for k, v in self.required_exif.items())
-        return results
+        )
+
+    def evaluate_precomputed(self, ctx: ImageContext) -> dict[str, bool]:
+        """Like :meth:`evaluate`, with the image-derived values computed once by the caller."""
+        return {name: check(ctx) for name, check in self._checks()[0]}
 
     def matches(
         self,
@@ -99,32 +246,32 @@ class ProfileConditions:
         exif: dict[str, Any] | None = None,
     ) -> bool:
         """Return ``True`` if the image properties satisfy the conditions."""
-        return all(
-            self.evaluate(
+        return self.matches_precomputed(
+            ImageContext.from_size(
                 width,
                 height,
                 image_format=image_format,
                 has_transparency=has_transparency,
                 file_size=file_size,
                 exif=exif,
-            ).values()
+            )
         )
 
+    def matches_precomputed(self, ctx: ImageContext) -> bool:
+        """Like :meth:`evaluate_precomputed`, but stop at the first failing condition."""
+        return all(check(ctx) for _, check in self._checks()[1])
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> ProfileConditions:
-        def _nc(key: str) -> NumericCondition | None:
-            val = data.get(key)
-            return NumericCondition(**val) if isinstance(val, dict) else None
-
         return cls(
-            smallest_side=_nc("smallest_side"),
-            largest_side=_nc("largest_side"),
-            pixel_count=_nc("pixel_count"),
-            aspect_ratio=_nc("aspect_ratio"),
-            orientation=data.get("orientation"),
+            smallest_side=_numeric_condition(data, "smallest_side"),
+            largest_side=_numeric_condition(data, "largest_side"),
+            pixel_count=_numeric_condition(data, "pixel_count"),
+            aspect_ratio=_numeric_condition(data, "aspect_ratio"),
+            orientation=orientation.lower() if isinstance(orientation := data.get("orientation"), str) else None,
             input_formats=data.get("input_formats"),
             requires_transparency=data.get("requires_transparency"),
-            file_size=_nc("file_size"),
+            file_size=_numeric_condition(data, "file_size"),
             required_exif=data.get("required_exif"),
         )
 
@@ -142,11 +289,42 @@ class CompressionProfile:
     conditions: ProfileConditions = field(default_factory=ProfileConditions)
 
 
-def save_profiles(profiles: Sequence[CompressionProfile], file_path: Path) -> Path:
+def _cond_to_json_obj(cond: ProfileConditions) -> dict[str, Any]:
+    """Return the conditions that are set as a JSON-ready dict."""
+    data: dict[str, Any] = {}
+    for name in cond.__slots__:
+        value = getattr(cond, name)
+        if value is None:
+            continue
+        data[name] = {"op": value.op, "value": value.value} if isinstance(value, NumericCondition) else value
+    return data
+
+
+def _profile_to_json_obj(profile: CompressionProfile) -> dict[str, Any]:
+    """Return ``profile`` as a JSON-ready dict without deep-copying it."""
+    return {
+        "name": profile.name,
+        "quality": profile.quality,
+        "max_largest_side": profile.max_largest_side,
+        "max_smallest_side": profile.max_smallest_side,
+        "output_format": profile.output_format,
+        "advanced_params": profile.advanced_params,
+        "conditions": _cond_to_json_obj(profile.conditions),
+    }
+
+
+def save_profiles(profiles: Sequence[CompressionProfile], file_path: Path, *, pretty: bool = True) -> Path:
     """Save compression profiles to ``file_path`` in JSON format."""
-    data = [asdict(profile) for profile in profiles]
+    data = [_profile_to_json_obj(profile) for profile in profiles]
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    file_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    if HAS_ORJSON:
+        file_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0))
+        return file_path
+    with file_path.open("w", encoding="utf-8") as f:
+        if pretty:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        else:
+            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
     return file_path
 
 
@@ -154,19 +332,19 @@ def load_profiles(file_path: Path) -> list[CompressionProfile]:
     """Load compression profiles from ``file_path``."""
     if not file_path.exists():
         return []
-    raw = json.loads(file_path.read_text(encoding="utf-8"))
+    raw = orjson.loads(file_path.read_bytes()) if HAS_ORJSON else json.loads(file_path.read_text(encoding="utf-8"))
     profiles: list[CompressionProfile] = []
     for item in raw:
         cond = ProfileConditions.from_dict(item.get("conditions", {}))
-        fmt = item.get("output_format", "JPEG")
+        fmt = item.get("output_format", "JPEG").upper()
         # Backwards compatibility for older profile files
         if "advanced_params" in item:
             adv = item.get("advanced_params", {})
         else:
             adv = (
                 item.get("jpeg_params", {})
-                if fmt.upper() == "JPEG"
-                else (item.get("webp_params", {}) if fmt.upper() == "WEBP" else item.get("avif_params", {}))
+                if fmt == "JPEG"
+                else (item.get("webp_params", {}) if fmt == "WEBP" else item.get("avif_params", {}))
             )
         profile = CompressionProfile(
             name=item["name"],
@@ -181,53 +359,303 @@ def load_profiles(file_path: Path) -> list[CompressionProfile]:
     return profiles
 
 
+def _active_conditions(profiles: Sequence[CompressionProfile]) -> set[str]:
+    """Return the names of the conditions set on any of ``profiles``."""
+    return {name for profile in profiles for name, _ in profile.conditions._checks()[0]}
+
+
+def _required_exif_keys(profiles: Sequence[CompressionProfile]) -> frozenset[str]:
+    """Return the EXIF tag names any of ``profiles`` compares against."""
+    keys: set[str] = set()
+    for profile in profiles:
+        if profile.conditions.required_exif:
+            keys.update(profile.conditions.required_exif)
+    return frozenset(keys)
+
+
+@lru_cache(maxsize=64)
+def _exif_tag_ids(keys: frozenset[str]) -> dict[int, tuple[str, ...]]:
+    """Map the tag ids behind ``keys`` to the keys that refer to them.
+
+    Keys are tag names from ``ExifTags.TAGS`` or decimal tag ids, which
+    are used as they are without a name lookup.
+    """
+    ids: dict[int, tuple[str, ...]] = {}
+    names = {key for key in keys if not key.isdigit()}
+    if names:
+        for tag_id, name in ExifTags.TAGS.items():
+            if name in names:
+                ids[tag_id] = (name,)
+    for key in keys - names:
+        ids[int(key)] = (*ids.get(int(key), ()), key)
+    return ids
+
+
+# Precompiled (LONG, SHORT, IFD entry) readers per TIFF byte order
+_TIFF_STRUCTS = {
+    b"II": (struct.Struct("<I"), struct.Struct("<H"), struct.Struct("<HHI4s")),
+    b"MM": (struct.Struct(">I"), struct.Struct(">H"), struct.Struct(">HHI4s")),
+}
+
+
+def _read_exif_tags_fast(exif: bytes, wanted: set[int]) -> dict[int, Any] | None:
+    """Decode the ``wanted`` tags from the 0th IFD of raw EXIF data.
+
+    Only ASCII strings and single SHORT/LONG values are decoded, the same way
+    ``Image.getexif()`` does. ``None`` is returned for anything else, so the
+    caller can fall back to Pillow's full parser.
+    """
+    if exif.startswith(b"Exif\x00\x00"):
+        exif = exif[6:]
+    structs = _TIFF_STRUCTS.get(exif[:2])
+    if structs is None:
+        return None
+    long, short, entry = structs
+    found: dict[int, Any] = {}
+    try:
+        (ifd_offset,) = long.unpack_from(exif, 4)
+        (count,) = short.unpack_from(exif, ifd_offset)
+        for index in range(count):
+            tag, typ, n, value = entry.unpack_from(exif, ifd_offset + 2 + 12 * index)
+            if tag not in wanted:
+                continue
+            if typ == 2:  # ASCII, stored inline when it fits into four bytes
+                if n > 4:
+                    (offset,) = long.unpack(value)
+                    value = exif[offset : offset + n]
+                data = value[:n]
+                if data.endswith(b"\x00"):
+                    data = data[:-1]
+                found[tag] = data.decode("latin-1", "replace")
+            elif typ == 3 and n == 1:  # SHORT
+                found[tag] = short.unpack_from(value)[0]
+            elif typ == 4 and n == 1:  # LONG
+                found[tag] = long.unpack(value)[0]
+            else:
+                return None
+            if len(found) == len(wanted):
+                break
+    except struct.error:
+        return None
+    return found
+
+
+def _image_exif(img: Image.Image, keys: frozenset[str]) -> dict[str, Any]:
+    """Return the EXIF tags referred to by ``keys``, keyed by those keys."""
+    ids = _exif_tag_ids(keys)
+    raw = img.info.get("exif")
+    if isinstance(raw, bytes):
+        fast = _read_exif_tags_fast(raw, set(ids))
+        if fast is not None:
+            exif = {key: v for k, v in fast.items() for key in ids[k]}
+            # Missing tags may still come from XMP, which only getexif() reads
+            if keys <= exif.keys():
+                return exif
+    tags = img.getexif()
+    return {key: tags[tag_id] for tag_id, tag_keys in ids.items() if tag_id in tags for key in tag_keys}
+
+
+def image_has_transparency(img: Image.Image) -> bool:
+    """Return ``True`` for modes with alpha and for images with a ``tRNS`` colour."""
+    # has_transparency_data is missing in Pillow-SIMD builds before 10.1
+    has_data = getattr(img, "has_transparency_data", None)
+    if has_data is not None:
+        return bool(has_data)
+    return "A" in img.mode or "transparency" in img.info
+
+
+@lru_cache(maxsize=1024)
+def _probe_image_cached(
+    path: str,
+    mtime_ns: int,  # noqa: ARG001
+    size: int,  # noqa: ARG001
+    exif_keys: frozenset[str],
+) -> tuple[int, int, str, bool, tuple[tuple[str, Any], ...] | None]:
+    """Return the image properties profiles are matched against.
+
+    ``mtime_ns`` and ``size`` are only part of the cache key, so that a
+    modified file is probed again.
+    """
+    with Image.open(path) as img:
+        width, height = img.size
+        image_format = img.format or ""  # Upper-cased by ImageContext.from_size
+        has_transparency = image_has_transparency(img)
+        exif = tuple(_image_exif(img, exif_keys).items()) if exif_keys else None
+    return width, height, image_format, has_transparency, exif
+
+
+def clear_image_cache() -> None:
+    """Forget the image properties cached by :func:`select_profile`."""
+    _probe_image_cached.cache_clear()
+
+
 def select_profile(
     image: Path | str | Image.Image,
     profiles: Sequence[CompressionProfile],
     *,
+    file_size: int | None = None,
     return_condition_results: bool = False,
 ) -> CompressionProfile | None | tuple[CompressionProfile | None, dict[str, dict[str, bool]]]:
     """Return the first profile whose conditions match the image.
 
-    If ``return_condition_results`` is ``True``, also return evaluation
-    results for all profiles.
+    ``file_size`` is the size of the source file when ``image`` is an
+    already opened image; without it the size is taken from the image's
+    file name, if it has one. A path that does not exist selects no
+    profile. If ``return_condition_results`` is ``True``, also return
+    evaluation results for all profiles.
 
     Profiles are evaluated from the end of the sequence to the start so that
     lower panels in the UI take precedence over the ones above them. The top
     profile therefore acts as a default fallback.
     """
-    file_size: int | None = None
+    # Only read the image properties that some profile compares against
+    active = _active_conditions(profiles)
+    exif_keys = _required_exif_keys(profiles) if "required_exif" in active else frozenset()
+    image_format: str | None
+    has_transparency: bool | None
+    exif: dict[str, Any] | Callable[[], dict[str, Any]] | None = None
     if isinstance(image, str | Path):
         path = Path(image)
-        file_size = path.stat().st_size if path.exists() else None
-        with Image.open(path) as img:
-            width, height = img.size
-            image_format = (img.format or "").upper()
-            has_transparency = "A" in img.getbands() or "transparency" in img.info
-            exif = {ExifTags.TAGS.get(k, str(k)): v for k, v in img.getexif().items()}
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return (None, {}) if return_condition_results else None
+        file_size = st.st_size
+        width, height, image_format, has_transparency, exif_items = _probe_image_cached(
+            str(path), st.st_mtime_ns, st.st_size, exif_keys
+        )
+        if exif_items is not None:
+            exif = dict(exif_items)
     else:
         width, height = image.size
-        image_format = (image.format or "").upper()
-        has_transparency = "A" in image.getbands() or "transparency" in image.info
-        exif = {ExifTags.TAGS.get(k, str(k)): v for k, v in image.getexif().items()}
+        image_format = (image.format or "") if "input_formats" in active else None
+        has_transparency = image_has_transparency(image) if "requires_transparency" in active else None
+        if exif_keys:
+            # Only read once a profile gets as far as its EXIF condition
+            exif = partial(_image_exif, image, exif_keys)
+        filename = getattr(image, "filename", None)
+        if file_size is None and filename and "file_size" in active:
+            file_size = Path(filename).stat().st_size
 
-    results: dict[str, dict[str, bool]] = {}
-    for profile in profiles:
-        results[profile.name] = profile.conditions.evaluate(
-            width,
-            height,
-            image_format=image_format,
-            has_transparency=has_transparency,
-            file_size=file_size,
-            exif=exif,
-        )
+    ctx = ImageContext.from_size(
+        width,
+        height,
+        image_format=image_format,
+        has_transparency=has_transparency,
+        file_size=file_size,
+        exif=exif,
+    )
+    if not return_condition_results:
+        for profile in reversed(profiles):
+            if profile.conditions.matches_precomputed(ctx):
+                return profile
+        return None
 
+    # Later profiles take precedence, so the last match of a forward pass wins
+    results: dict[str, dict[str, bool]] = {}
     selected: CompressionProfile | None = None
-    for profile in reversed(profiles):
-        if all(results[profile.name].values()):
+    for profile in profiles:
+        results[profile.name] = res = profile.conditions.evaluate_precomputed(ctx)
+        if all(res.values()):
             selected = profile
-            break
+    return selected, results
+
+
+def select_profiles_bulk(
+    paths: Iterable[Path | str],
+    profiles: Sequence[CompressionProfile],
+    *,
+    max_workers: int | None = None,
+) -> list[CompressionProfile | None]:
+    """Return the selected profile for each of ``paths``, probing them in parallel.
+
+    Opening the files and reading their headers is I/O bound, so a thread
+    pool is used. ``profiles`` must not be modified during the call.
+    """
+    _active_conditions(profiles)  # Compile the checks once, before the threads share them
+    workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(partial(_select_profile_only, profiles=profiles), paths))
+
+
+def _select_profile_only(path: Path | str, profiles: Sequence[CompressionProfile]) -> CompressionProfile | None:
+    return cast(CompressionProfile | None, select_profile(path, profiles))
+
+
+# Numeric conditions and the ImageContext attribute they compare
+_NUMERIC_CONDITIONS = {
+    "smallest_side": "smallest_side",
+    "largest_side": "largest_side",
+    "pixel_count": "pixels",
+    "aspect_ratio": "aspect_ratio",
+    "file_size": "file_size",
+}
+
+
+def _path_context(path: Path | str, exif_keys: frozenset[str]) -> ImageContext | None:
+    """Return the probed properties of the file at ``path``, ``None`` if it is missing."""
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    width, height, image_format, has_transparency, exif_items = _probe_image_cached(
+        str(path), st.st_mtime_ns, st.st_size, exif_keys
+    )
+    return ImageContext.from_size(
+        width,
+        height,
+        image_format=image_format,
+        has_transparency=has_transparency,
+        file_size=st.st_size,
+        exif=dict(exif_items) if exif_items is not None else None,
+    )
+
+
+def select_profiles_batch(
+    images: Sequence[Path | str],
+    profiles: Sequence[CompressionProfile],
+) -> list[CompressionProfile | None]:
+    """Return the selected profile for each of ``images``, like :func:`select_profile`.
+
+    With NumPy installed, the numeric conditions of each profile are
+    evaluated for all images at once; the other conditions still run per
+    image. Without it, the profiles are matched image by image.
+    """
+    active = _active_conditions(profiles)
+    exif_keys = _required_exif_keys(profiles) if "required_exif" in active else frozenset()
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        contexts = list(executor.map(partial(_path_context, exif_keys=exif_keys), images))
+
+    selected: list[CompressionProfile | None] = [None] * len(contexts)
+    found = [(index, ctx) for index, ctx in enumerate(contexts) if ctx is not None]
+    if not found or not profiles:
+        return selected
+    if not HAS_NUMPY:
+        for index, ctx in found:
+            selected[index] = next((p for p in reversed(profiles) if p.conditions.matches_precomputed(ctx)), None)
+        return selected
+
+    ctxs = [ctx for _, ctx in found]
+    columns = {
+        attr: np.fromiter((getattr(ctx, attr) for ctx in ctxs), dtype=float, count=len(ctxs))
+        for attr in _NUMERIC_CONDITIONS.values()
+    }
+    masks = np.ones((len(profiles), len(ctxs)), dtype=bool)
+    for row, profile in enumerate(profiles):
+        for name, check in profile.conditions._checks()[1]:
+            if name in _NUMERIC_CONDITIONS:
+                cond = getattr(profile.conditions, name)
+                compare = _COMPARATORS.get(cond.op)
+                if compare is None:
+                    masks[row] = False
+                else:
+                    masks[row] &= compare(columns[_NUMERIC_CONDITIONS[name]], cond.value)
+            else:
+                masks[row] &= np.fromiter((check(ctx) for ctx in ctxs), dtype=bool, count=len(ctxs))
 
-    if return_condition_results:
-        return selected, results
+    # Later profiles take precedence: find the last matching row per image
+    last = len(profiles) - 1 - np.argmax(masks[::-1], axis=0)
+    for (index, _), row, matched in zip(found, last, masks.any(axis=0), strict=True):
+        if matched:
+            selected[index] = profiles[row]
     return selected
@@ -1,17 +1,21 @@
-SUPPORTED_EXTENSIONS = {
-    ".jpg",
-    ".jpeg",
-    ".png",
-    ".bmp",
-    ".tiff",
-    ".tif",
-    ".webp",
-    ".avif",
-    ".heic",
-    ".heif",
-    ".gif",
-    ".ico",
-    ".ppm",
-    ".pgm",
-    ".pbm",
-}
+from typing import Final
+
+SUPPORTED_EXTENSIONS: Final = frozenset(
+    {
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".bmp",
+        ".tiff",
+        ".tif",
+        ".webp",
+        ".avif",
+        ".heic",
+        ".heif",
+        ".gif",
+        ".ico",
+        ".ppm",
+        ".pgm",
+        ".pbm",
+    }
+)
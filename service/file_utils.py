@@ -1,14 +1,53 @@
 import os
+from collections.abc import Iterator
 from datetime import timedelta
 from pathlib import Path
 
 
-def copy_times_from_src(src: Path, dst: Path) -> None:
-    """Copy access and modification times from src to dst."""
-    st = src.stat()
+def iter_files(root: str | Path) -> Iterator[os.DirEntry[str]]:
+    """Recursively yield file entries below ``root`` using :func:`os.scandir`.
+
+    ``DirEntry`` caches the file type from the directory listing, so no
+    extra ``stat`` call is made per file. Like ``Path.rglob``, symlinked
+    directories are not followed and unreadable or missing directories are
+    skipped.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
+
+def lower_suffix(name: str) -> str:
+    """Return the lowercase suffix of ``name`` with the semantics of ``Path.suffix``."""
+    stem, dot, ext = name.rpartition(".")
+    if not dot or not ext or not stem:
+        return ""
+    return f".{ext.lower()}"
+
+
+def copy_times_from_stat(st: os.stat_result, dst: Path) -> None:
+    """Apply the access and modification times of ``st`` to dst."""
     os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
 
 
+def copy_times_from_src(src: Path | os.DirEntry[str] | os.stat_result, dst: Path) -> None:
+    """Copy access and modification times from src to dst.
+
+    ``src`` may also be a ``DirEntry``, whose cached stat is reused, or the
+    result of an earlier ``stat`` call, in which case no stat is made.
+    """
+    copy_times_from_stat(src if isinstance(src, os.stat_result) else src.stat(), dst)
+
+
 def format_timedelta(delta: timedelta) -> str:
     """Format a timedelta to a human-readable string."""
     total_seconds = int(delta.total_seconds())
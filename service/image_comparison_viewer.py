@@ -4,17 +4,18 @@ Image Comparison Viewer
 A PySide6 application for comparing pairs of images with interactive features.
 """
 
-import json
 import sys
 from datetime import timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 from PySide6.QtCore import (
+    QEvent,
     QMetaObject,
     QObject,
     QPoint,
     QRect,
+    QRectF,
     QRunnable,
     QSize,
     Qt,
@@ -25,6 +26,9 @@ from PySide6.QtCore import (
 )
 from PySide6.QtGui import (
     QColor,
+    QEnterEvent,
+    QFont,
+    QFontMetrics,
     QMouseEvent,
     QPainter,
     QPaintEvent,
@@ -49,7 +53,8 @@ from PySide6.QtWidgets import (
 )
 
 from service.constants import SUPPORTED_EXTENSIONS
-from service.file_utils import format_timedelta
+from service.file_utils import format_timedelta, iter_files, lower_suffix
+from service.image_compression import load_compression_settings, read_settings_file
 from service.image_pair import ImagePair
 from service.parameters_defaults import (
     AVIF_DEFAULTS,
@@ -128,13 +133,14 @@ class ThumbnailObserver(QObject):
 class ThumbnailRunnable(QRunnable):
     """Worker that generates a thumbnail for a single image pair."""
 
-    def __init__(self, pair: ImagePair, observer: ThumbnailObserver) -> None:
+    def __init__(self, pair: ImagePair, observer: ThumbnailObserver, size: QSize | None = None) -> None:
         super().__init__()
         self.pair = pair
         self.observer = observer
+        self.size = size
 
     def run(self) -> None:  # pragma: no cover - thread pool execution
-        self.pair.ensure_thumbnail_cached()
+        self.pair.ensure_thumbnail_cached(self.size)
         QMetaObject.invokeMethod(
             self.observer,
             "report_done",
@@ -142,8 +148,10 @@ class ThumbnailRunnable(QRunnable):
         )  # type: ignore[call-overload]
 
 
-FORMATS_PATTERNS = " ".join(f"*.{f}" for f in SUPPORTED_EXTENSIONS)
+# Extensions already carry their dot; sorted so the dialog filter is stable
+FORMATS_PATTERNS = " ".join(sorted(f"*{ext}" for ext in SUPPORTED_EXTENSIONS))
 FORMATS_PATTERN = f"Images ({FORMATS_PATTERNS})"
+_LABEL_PADDING = 6
 
 
 class ComparisonViewer(QWidget):
@@ -161,6 +169,12 @@ class ComparisonViewer(QWidget):
         self.zoom_factor = 1.0
         self.pan_offset = QPoint(0, 0)
         self.slider_position = 0.5  # 0.0 = left, 1.0 = right
+        self._display_rect_cache: tuple[QSize, QRect] | None = None
+        # Display centre x and scaled width of the first image from the last paint
+        self._slider_geometry: tuple[int, int] | None = None
+        # Profile and resolution labels, rendered once per image pair
+        self._label_pixmaps: tuple[QPixmap, QPixmap, QPixmap, QPixmap] | None = None
+        self._scaled_cache: tuple[tuple[int, int, int, int, float], tuple[QPixmap, QPixmap], bool] | None = None
 
         # Mouse interaction state
         self.is_panning = False
@@ -181,10 +195,23 @@ class ComparisonViewer(QWidget):
         """)
         self.left_profile_rect = QRect()
         self.right_profile_rect = QRect()
+        # Reused by paintEvent via setRect() instead of allocating each frame
+        self._left_clip = QRect()
+        self._right_clip = QRect()
+        self._handle_rect = QRect()
+
+        # Coalesce bursts of wheel events into at most one repaint per frame
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(16)
+        self._update_timer.timeout.connect(self.update)
 
     def set_image_pair(self, image_pair: ImagePair) -> None:
         """Set the image pair to display."""
         self.image_pair = image_pair
+        self._scaled_cache = None
+        self._slider_geometry = None
+        self._label_pixmaps = None
         self.reset_view()
         self.update()
 
@@ -200,7 +227,13 @@ class ComparisonViewer(QWidget):
 
     def get_display_rect(self) -> QRect:
         """Get the rectangle where images should be displayed."""
-        return self.rect().adjusted(10, 10, -10, -10)
+        size = self.size()
+        cached = self._display_rect_cache
+        if cached is not None and cached[0] == size:
+            return cached[1]
+        rect = self.rect().adjusted(10, 10, -10, -10)
+        self._display_rect_cache = (size, rect)
+        return rect
 
     def get_original_image_sizes(self) -> tuple[tuple[int, int], tuple[int, int]]:
         """Get original dimensions of both images."""
@@ -232,21 +265,27 @@ class ComparisonViewer(QWidget):
         if target_size.width() <= 0 or target_size.height() <= 0:
             return QPixmap(), QPixmap()
 
-        scaled1 = pixmap1.scaled(
-            target_size,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation,
-        )
-        scaled2 = pixmap2.scaled(
-            target_size,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation,
+        # Paint and mouse handlers ask for the same pair many times per frame
+        key = (
+            pixmap1.cacheKey(),
+            pixmap2.cacheKey(),
+            target_size.width(),
+            target_size.height(),
+            self.zoom_factor,
         )
+        # Fast previews taken while dragging are redone smoothly once it ends
+        interactive = self.is_panning or self.is_dragging_slider
+        if self._scaled_cache is not None and self._scaled_cache[0] == key and (self._scaled_cache[2] or interactive):
+            return self._scaled_cache[1]
+
+        # Work out the final sizes first so each pixmap is resampled only once
+        size1 = pixmap1.size().scaled(target_size, Qt.AspectRatioMode.KeepAspectRatio)
+        size2 = pixmap2.size().scaled(target_size, Qt.AspectRatioMode.KeepAspectRatio)
 
         # Apply zoom with safety checks
         if self.zoom_factor != 1.0 and self.zoom_factor > 0:
             try:
-                zoomed_size = scaled1.size() * self.zoom_factor
+                zoomed_size = size1 * self.zoom_factor
                 # Ensure zoomed size is reasonable
                 if (
                     zoomed_size.width() > 0
@@ -254,20 +293,25 @@ class ComparisonViewer(QWidget):
                     and zoomed_size.width() < 10000
                     and zoomed_size.height() < 10000
                 ):
-                    scaled1 = scaled1.scaled(
-                        zoomed_size,
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation,
-                    )
-                    scaled2 = scaled2.scaled(
-                        zoomed_size,
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation,
-                    )
+                    size1 = zoomed_size
+                    size2 = size2.scaled(zoomed_size, Qt.AspectRatioMode.KeepAspectRatio)
             except (ValueError, OverflowError):
-                # If zoom calculation fails, return unscaled images
+                # If zoom calculation fails, return unzoomed images
                 pass
 
+        mode = Qt.TransformationMode.FastTransformation if interactive else Qt.TransformationMode.SmoothTransformation
+        scaled1 = pixmap1.scaled(
+            size1,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            mode,
+        )
+        scaled2 = pixmap2.scaled(
+            size2,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            mode,
+        )
+
+        self._scaled_cache = (key, (scaled1, scaled2), not interactive)
         return scaled1, scaled2
 
     def paintEvent(self, event: QPaintEvent | None) -> None:  # noqa: ARG002
@@ -301,8 +345,9 @@ class ComparisonViewer(QWidget):
         # Fill unused space with a slightly lighter shade
         painter.fillRect(display_rect, QColor("#333333"))
 
-        center_x = display_rect.center().x() + self.pan_offset.x()
-        center_y = display_rect.center().y() + self.pan_offset.y()
+        display_center = display_rect.center()
+        center_x = display_center.x() + self.pan_offset.x()
+        center_y = display_center.y() + self.pan_offset.y()
 
         # Calculate image positions (centered)
         img1_x = center_x - pixmap1.width() // 2
@@ -312,28 +357,28 @@ class ComparisonViewer(QWidget):
 
         # Calculate split position
         split_x = img1_x + int(pixmap1.width() * self.slider_position)
+        self._slider_geometry = (display_center.x(), pixmap1.width())
 
         # Draw first image (left part)
         if split_x > img1_x:
-            left_rect = QRect(img1_x, img1_y, split_x - img1_x, pixmap1.height())
-            painter.drawPixmap(left_rect, pixmap1, QRect(0, 0, split_x - img1_x, pixmap1.height()))
+            painter.save()
+            self._left_clip.setRect(img1_x, img1_y, split_x - img1_x, pixmap1.height())
+            painter.setClipRect(self._left_clip)
+            painter.drawPixmap(img1_x, img1_y, pixmap1)
+            painter.restore()
 
         # Draw second image (right part)
         if split_x < img2_x + pixmap2.width():
-            right_rect = QRect(split_x, img2_y, img2_x + pixmap2.width() - split_x, pixmap2.height())
-            right_source_x = int(split_x - img2_x)
-            if right_source_x >= 0 and right_source_x < pixmap2.width():
-                source_width = pixmap2.width() - right_source_x
-                if source_width > 0:
-                    painter.drawPixmap(
-                        right_rect,
-                        pixmap2,
-                        QRect(right_source_x, 0, source_width, pixmap2.height()),
-                    )
+            painter.save()
+            self._right_clip.setRect(split_x, img2_y, img2_x + pixmap2.width() - split_x, pixmap2.height())
+            painter.setClipRect(self._right_clip)
+            painter.drawPixmap(img2_x, img2_y, pixmap2)
+            painter.restore()
 
         # Draw thin slider handle (no line)
         handle_size = 8  # Much thinner handle
-        handle_rect = QRect(
+        handle_rect = self._handle_rect
+        handle_rect.setRect(
             split_x - handle_size // 2,
             center_y - handle_size // 2,
             handle_size,
@@ -373,6 +418,8 @@ class ComparisonViewer(QWidget):
             self.is_panning = False
             self.is_dragging_slider = False
             self.setCursor(Qt.CursorShape.ArrowCursor)
+            if self._scaled_cache is not None and not self._scaled_cache[2]:
+                self.update()
 
     def mouseMoveEvent(self, event: QMouseEvent | None) -> None:
         """Handle mouse move events."""
@@ -381,14 +428,13 @@ class ComparisonViewer(QWidget):
 
         if self.is_dragging_slider:
             # Update slider position
-            display_rect = self.get_display_rect()
-            pixmap1, _ = self.get_scaled_pixmaps()
-
-            if pixmap1.width() > 0:
-                center_x = display_rect.center().x() + self.pan_offset.x()
-                img1_x = center_x - pixmap1.width() // 2
+            origin = self._slider_origin()
+            if origin is not None:
+                img1_x, width = origin
                 relative_x = event.pos().x() - img1_x
-                self.slider_position = max(0.0, min(1.0, relative_x / pixmap1.width()))
+                # Inline clamp to [0, 1] without min()/max() calls per move
+                position = relative_x / width
+                self.slider_position = 0.0 if position < 0.0 else 1.0 if position > 1.0 else position
                 self.update()
 
         elif self.is_panning:
@@ -439,37 +485,46 @@ class ComparisonViewer(QWidget):
 
             if self.min_zoom <= new_zoom <= self.max_zoom:
                 self.zoom_factor = new_zoom
-                self.update()
+                self._schedule_update()
 
         elif modifiers & Qt.KeyboardModifier.ShiftModifier:
             # Horizontal scroll
             scroll_delta = delta // 8
             self.pan_offset.setX(self.pan_offset.x() - scroll_delta)
-            self.update()
+            self._schedule_update()
 
         else:
             # Vertical scroll
             scroll_delta = delta // 8
             self.pan_offset.setY(self.pan_offset.y() - scroll_delta)
-            self.update()
+            self._schedule_update()
+
+    def _schedule_update(self) -> None:
+        """Request a repaint unless one is already pending."""
+        if not self._update_timer.isActive():
+            self._update_timer.start()
 
     def is_near_slider(self, pos: QPoint) -> bool:
         """Check if a position is near the slider."""
         if not self.image_pair:
             return False
 
-        display_rect = self.get_display_rect()
-        pixmap1, _ = self.get_scaled_pixmaps()
-
-        if pixmap1.width() <= 0:
+        origin = self._slider_origin()
+        if origin is None:
             return False
 
-        center_x = display_rect.center().x() + self.pan_offset.x()
-        img1_x = center_x - pixmap1.width() // 2
-        split_x = img1_x + int(pixmap1.width() * self.slider_position)
+        img1_x, width = origin
+        split_x = img1_x + int(width * self.slider_position)
 
         return abs(pos.x() - split_x) <= 15
 
+    def _slider_origin(self) -> tuple[int, int] | None:
+        """Return the left edge and width of the first image as last painted."""
+        if self._slider_geometry is None:
+            return None
+        display_center_x, width = self._slider_geometry
+        return display_center_x + self.pan_offset.x() - width // 2, width
+
     def draw_image_resolutions(
         self,
         painter: QPainter,
@@ -487,83 +542,72 @@ class ComparisonViewer(QWidget):
         if not self.image_pair:
             return
 
-        (orig_width1, orig_height1), (orig_width2, orig_height2) = self.get_original_image_sizes()
-
-        font = painter.font()
-        font.setPointSize(10)
-        font.setBold(True)
-        painter.setFont(font)
-        painter.setPen(QPen(QColor(255, 255, 255)))
-
-        padding = 6
-        font_metrics = painter.fontMetrics()
-        text_height = font_metrics.height()
+        if self._label_pixmaps is None:
+            self._label_pixmaps = self._render_labels(self.image_pair)
+        left_profile, right_profile, left_resolution, right_resolution = self._label_pixmaps
 
-        # Profile labels
-        profile1 = self.image_pair.profile1 if self.image_pair.profile1 != "Raw" else tr("Original photo")
-        profile2 = self.image_pair.profile2 if self.image_pair.profile2 != "Raw" else tr("Original photo")
-        left_profile_text = tr("Profile: {name}").format(name=profile1)
-        right_profile_text = tr("Profile: {name}").format(name=profile2)
-        left_profile_width = font_metrics.horizontalAdvance(left_profile_text)
-        right_profile_width = font_metrics.horizontalAdvance(right_profile_text)
+        # Pixmaps are rendered at device resolution, positions use logical size
+        profile_rect_height = round(left_profile.height() / left_profile.devicePixelRatio())
+        left_profile_width = round(left_profile.width() / left_profile.devicePixelRatio())
+        right_profile_width = round(right_profile.width() / right_profile.devicePixelRatio())
+        right_text_width = round(right_resolution.width() / right_resolution.devicePixelRatio())
 
-        profile_rect_height = text_height + 2 * padding
         left_profile_rect = QRect(
             img1_x + 10,
             img1_y + scaled_height1 - 2 * profile_rect_height - 10,
-            left_profile_width + 2 * padding,
+            left_profile_width,
             profile_rect_height,
         )
         right_profile_rect = QRect(
-            img2_x + scaled_width2 - right_profile_width - 2 * padding - 10,
+            img2_x + scaled_width2 - right_profile_width - 10,
             img2_y + scaled_height2 - 2 * profile_rect_height - 10,
-            right_profile_width + 2 * padding,
+            right_profile_width,
             profile_rect_height,
         )
-        painter.fillRect(left_profile_rect, QColor(0, 0, 0, 180))
-        painter.fillRect(right_profile_rect, QColor(0, 0, 0, 180))
-        painter.drawText(
-            left_profile_rect.adjusted(padding, padding, -padding, -padding),
-            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-            left_profile_text,
-        )
-        painter.drawText(
-            right_profile_rect.adjusted(padding, padding, -padding, -padding),
-            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
-            right_profile_text,
-        )
+        painter.drawPixmap(left_profile_rect.topLeft(), left_profile)
+        painter.drawPixmap(right_profile_rect.topLeft(), right_profile)
         self.left_profile_rect = left_profile_rect
         self.right_profile_rect = right_profile_rect
 
         # Resolution labels below profiles
-        left_resolution_text = f"{orig_width1} × {orig_height1}"
-        left_text_width = font_metrics.horizontalAdvance(left_resolution_text)
-        left_text_rect = QRect(
-            img1_x + 10,
-            left_profile_rect.bottom() - text_height - padding + profile_rect_height,
-            left_text_width + 2 * padding,
-            profile_rect_height,
-        )
-        painter.fillRect(left_text_rect, QColor(0, 0, 0, 180))
-        painter.drawText(
-            left_text_rect.adjusted(padding, padding, -padding, -padding),
-            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-            left_resolution_text,
+        painter.drawPixmap(img1_x + 10, left_profile_rect.bottom() + _LABEL_PADDING, left_resolution)
+        painter.drawPixmap(
+            img2_x + scaled_width2 - right_text_width - 10,
+            right_profile_rect.bottom() + _LABEL_PADDING,
+            right_resolution,
         )
 
-        right_resolution_text = f"{orig_width2} × {orig_height2}"
-        right_text_width = font_metrics.horizontalAdvance(right_resolution_text)
-        right_text_rect = QRect(
-            img2_x + scaled_width2 - right_text_width - 2 * padding - 10,
-            right_profile_rect.bottom() - text_height - padding + profile_rect_height,
-            right_text_width + 2 * padding,
-            profile_rect_height,
-        )
-        painter.fillRect(right_text_rect, QColor(0, 0, 0, 180))
-        painter.drawText(
-            right_text_rect.adjusted(padding, padding, -padding, -padding),
-            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
-            right_resolution_text,
+    def _render_labels(self, image_pair: ImagePair) -> tuple[QPixmap, QPixmap, QPixmap, QPixmap]:
+        """Pre-render the profile and resolution labels of an image pair."""
+        (orig_width1, orig_height1), (orig_width2, orig_height2) = self.get_original_image_sizes()
+        profile1 = image_pair.profile1 if image_pair.profile1 != "Raw" else tr("Original photo")
+        profile2 = image_pair.profile2 if image_pair.profile2 != "Raw" else tr("Original photo")
+
+        font = QFont(self.font())
+        font.setPointSize(10)
+        font.setBold(True)
+        font_metrics = QFontMetrics(font)
+        ratio = self.devicePixelRatioF()
+        padding = _LABEL_PADDING
+        height = font_metrics.height() + 2 * padding
+
+        def render(text: str) -> QPixmap:
+            width = font_metrics.horizontalAdvance(text) + 2 * padding
+            pixmap = QPixmap(round(width * ratio), round(height * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(QColor(0, 0, 0, 180))
+            label_painter = QPainter(pixmap)
+            label_painter.setFont(font)
+            label_painter.setPen(QPen(QColor(255, 255, 255)))
+            label_painter.drawText(QRect(0, 0, width, height), Qt.AlignmentFlag.AlignCenter, text)
+            label_painter.end()
+            return pixmap
+
+        return (
+            render(tr("Profile: {name}").format(name=profile1)),
+            render(tr("Profile: {name}").format(name=profile2)),
+            render(f"{orig_width1} × {orig_height1}"),
+            render(f"{orig_width2} × {orig_height2}"),
         )
 
     def _build_profile_tooltip(
@@ -630,6 +674,10 @@ class ThumbnailWidget(QWidget):
 
     clicked = Signal(ImagePair)
 
+    # Shared (normal, hovered) frames; created on first paint once a
+    # QApplication exists
+    _frames: ClassVar[tuple[QPixmap, QPixmap] | None] = None
+
     def __init__(self, image_pair: ImagePair, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self.image_pair = image_pair
@@ -641,25 +689,52 @@ class ThumbnailWidget(QWidget):
         self._spinner_angle = 0
         self._spinner_timer = QTimer(self)
         self._spinner_timer.timeout.connect(self._advance_spinner)
+        self._observer: ThumbnailObserver | None = None
+        self._hovered = False
 
-        self.setStyleSheet("""
-            QWidget {
-                border: 2px solid #444;
-                border-radius: 8px;
-                background-color: #333;
-                margin: 5px;
-            }
-            QWidget:hover {
-                border-color: #666;
-                background-color: #444;
-            }
-        """)
+        # The tile has a fixed size, so its layout is computed once
+        name = image_pair.name
+        self._display_name = name[:15] + "..." if len(name) > 15 else name
+        label_height = 20
+        self._available_height = self.height() - label_height
+        self._label_rect = QRect(0, self._available_height, self.width(), label_height)
+        self._spinner_center = self.rect().center()
+
+    @classmethod
+    def _frame_pixmaps(cls) -> tuple[QPixmap, QPixmap]:
+        if cls._frames is None:
+            cls._frames = (
+                cls._render_frame(QColor("#333"), QColor("#444")),
+                cls._render_frame(QColor("#444"), QColor("#666")),
+            )
+        return cls._frames
+
+    @staticmethod
+    def _render_frame(background: QColor, border: QColor) -> QPixmap:
+        """Draw the rounded tile frame: 5 px margin, 2 px border, 8 px radius."""
+        pixmap = QPixmap(120, 120)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(border, 2))
+        painter.setBrush(background)
+        painter.drawRoundedRect(QRectF(6, 6, 108, 108), 8, 8)
+        painter.end()
+        return pixmap
 
     def _advance_spinner(self) -> None:
         self._spinner_angle = (self._spinner_angle + 30) % 360
         self.update()
 
+    def _start_loading(self) -> None:
+        # The preview is decoded into a QImage off the GUI thread; the QPixmap
+        # is only created in _load_thumbnail once the worker reports back
+        self._observer = ThumbnailObserver(1)
+        self._observer.finished.connect(self._load_thumbnail)
+        QThreadPool.globalInstance().start(ThumbnailRunnable(self.image_pair, self._observer, self.thumbnail_size))
+
     def _load_thumbnail(self) -> None:
+        self._observer = None
         self._thumbnail = self.image_pair.create_thumbnail(self.thumbnail_size)
         self._is_loading = False
         self._spinner_timer.stop()
@@ -668,17 +743,15 @@ class ThumbnailWidget(QWidget):
     def paintEvent(self, event: QPaintEvent | None) -> None:  # noqa: ARG002
         """Draw the thumbnail or a loading spinner."""
         painter = QPainter(self)
-
-        label_height = 20
-        available_height = self.height() - label_height
+        painter.drawPixmap(0, 0, self._frame_pixmaps()[self._hovered])
 
         if self._thumbnail is None:
             if not self._is_loading:
                 self._is_loading = True
                 self._spinner_timer.start(100)
-                QTimer.singleShot(10, self._load_thumbnail)
+                self._start_loading()
             radius = 15
-            center = self.rect().center()
+            center = self._spinner_center
             pen = QPen(QColor(200, 200, 200))
             pen.setWidth(3)
             painter.setPen(pen)
@@ -692,7 +765,7 @@ class ThumbnailWidget(QWidget):
             )
         else:
             x = (self.width() - self._thumbnail.width()) // 2
-            y = (available_height - self._thumbnail.height()) // 2
+            y = (self._available_height - self._thumbnail.height()) // 2
             painter.drawPixmap(x, y, self._thumbnail)
 
         # Draw name below the thumbnail
@@ -701,18 +774,23 @@ class ThumbnailWidget(QWidget):
         font.setPointSize(8)
         painter.setFont(font)
 
-        text_rect = QRect(0, available_height, self.width(), label_height)
-        painter.drawText(
-            text_rect,
-            Qt.AlignmentFlag.AlignCenter,
-            self.image_pair.name[:15] + "..." if len(self.image_pair.name) > 15 else self.image_pair.name,
-        )
+        painter.drawText(self._label_rect, Qt.AlignmentFlag.AlignCenter, self._display_name)
 
     def mousePressEvent(self, event: QMouseEvent | None) -> None:
         """Handle click events."""
         if event is not None and event.button() == Qt.MouseButton.LeftButton:
             self.clicked.emit(self.image_pair)
 
+    def enterEvent(self, event: QEnterEvent | None) -> None:  # noqa: ARG002
+        """Highlight the frame while hovered."""
+        self._hovered = True
+        self.update()
+
+    def leaveEvent(self, event: QEvent | None) -> None:  # noqa: ARG002
+        """Restore the normal frame."""
+        self._hovered = False
+        self.update()
+
 
 class ThumbnailCarousel(QScrollArea):
     """Horizontal scroll area for displaying image pair thumbnails."""
@@ -1272,10 +1350,8 @@ class MainWindow(QMainWindow):
         self.load_config_from_path(Path(file_path))
 
     def load_config_from_path(self, path: Path) -> None:
-        try:
-            with path.open() as f:
-                data = json.load(f)
-        except Exception:
+        data = load_compression_settings(path)
+        if data is None:
             return
         self.clear_pairs()
         self.profile_map1 = {}
@@ -1315,8 +1391,8 @@ class MainWindow(QMainWindow):
         self.clear_pairs()
         stats1_file = dir1 / "compression_settings.json"
         stats2_file = dir2 / "compression_settings.json"
-        data1 = json.load(stats1_file.open()) if stats1_file.exists() else {}
-        data2 = json.load(stats2_file.open()) if stats2_file.exists() else {}
+        data1 = read_settings_file(stats1_file) if stats1_file.exists() else {}
+        data2 = read_settings_file(stats2_file) if stats2_file.exists() else {}
         self.profile_map1 = {p["name"]: p for p in data1.get("compression_settings", {}).get("profiles", [])}
         self.profile_map2 = {p["name"]: p for p in data2.get("compression_settings", {}).get("profiles", [])}
         pair_map1 = {
@@ -1336,21 +1412,26 @@ class MainWindow(QMainWindow):
             if pair.get("compressed")
         }
 
-        for file1 in dir1.rglob("*"):
-            if not file1.is_file() or file1.suffix.lower() not in SUPPORTED_EXTENSIONS:
+        # Index the second tree once instead of probing every extension on disk
+        files2 = {
+            Path(entry.path).relative_to(dir2)
+            for entry in iter_files(dir2)
+            if lower_suffix(entry.name) in SUPPORTED_EXTENSIONS
+        }
+        by_stem2: dict[Path, Path] = {}
+        for rel_candidate in files2:
+            by_stem2.setdefault(rel_candidate.with_suffix(""), rel_candidate)
+
+        for entry in iter_files(dir1):
+            if lower_suffix(entry.name) not in SUPPORTED_EXTENSIONS:
                 continue
+            file1 = Path(entry.path)
             rel = file1.relative_to(dir1)
-            file2 = dir2 / rel
-            if not file2.exists():
-                for ext in SUPPORTED_EXTENSIONS:
-                    candidate = file2.with_suffix(ext)
-                    if candidate.exists():
-                        file2 = candidate
-                        break
-            if file2.exists():
-                rel2 = file2.relative_to(dir2)
+            match = rel if rel in files2 else by_stem2.get(rel.with_suffix(""))
+            if match is not None:
+                file2 = dir2 / match
                 key1 = rel.as_posix()
-                key2 = rel2.as_posix()
+                key2 = match.as_posix()
                 prof1, cond1 = pair_map1.get(key1, ("Raw", {}))
                 prof2, cond2 = pair_map2.get(key2, ("Raw", {}))
                 pair_name = key1 if key1 == key2 else f"{key1} vs {key2}"
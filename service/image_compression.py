@@ -4,21 +4,45 @@ Image Compression Module
 Handles image compression with configurable quality and size parameters.
 """
 
+import io
 import logging
+import mmap
+import multiprocessing
 import os
+import queue
 import shutil
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import struct
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from threading import Event, Lock
-from typing import Any, Callable, Sequence, cast
+from threading import Event
+from typing import Any, BinaryIO, cast
 
-from PIL import Image
+from PIL import Image, ImageCms, ImageOps, features
 from pillow_heif import register_heif_opener
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, see requirements-fast.txt
+    HAS_ORJSON = False
+else:
+    HAS_ORJSON = True
+
 from service.compression_profiles import CompressionProfile, select_profile
 from service.constants import SUPPORTED_EXTENSIONS
-from service.file_utils import copy_times_from_src
-from service.save_functions import save_avif, save_jpeg, save_webp
+from service.file_utils import copy_times_from_src, copy_times_from_stat, iter_files, lower_suffix
+from service.parameters_defaults import AVIF_DEFAULTS, WEBP_DEFAULTS
+from service.save_functions import (
+    AVIFENC,
+    CWEBP,
+    save_avif,
+    save_avif_avifenc,
+    save_jpeg,
+    save_webp,
+    save_webp_cwebp,
+)
 from service.translator import tr
 
 register_heif_opener()
@@ -28,6 +52,196 @@ register_heif_opener()
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Pillow-SIMD is published with ``.postN`` versions; it vectorises the resize
+# kernels, see requirements-fast.txt
+PILLOW_SIMD = ".post" in Image.__version__
+
+
+def log_pillow_build() -> None:
+    """Log the Pillow build and its libwebp version.
+
+    Called once at application start rather than on import, which every
+    spawned worker process repeats.
+    """
+    # Pillow wheels >= 11.3 bundle libwebp >= 1.5 with its SSE2/NEON encoder paths.
+    # Pillow-SIMD is built against the system libwebp, which may be older
+    webp_version = features.version("webp") or "missing"
+    logger.info(f"Pillow build: {Image.__version__}{' SIMD' if PILLOW_SIMD else ''}, libwebp {webp_version}")
+
+
+# Progress is logged at INFO level once per this many processed images
+_LOG_EVERY = 100
+
+# Files at least this large are memory-mapped instead of read through a buffer;
+# below it the mapping setup costs more than the copy it saves
+_MMAP_MIN_SIZE = 1024 * 1024
+
+_EXIF_ORIENTATION = 0x0112
+
+# Input suffixes that already match an output format
+_FORMAT_SUFFIXES = {
+    "JPEG": (".jpg", ".jpeg"),
+    "WEBP": (".webp",),
+    "AVIF": (".avif",),
+}
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# SOFn markers carrying frame dimensions (DHT, JPG and DAC share the range)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_dimensions(f: BinaryIO) -> tuple[int, int] | None:
+    """Walk JPEG segments after SOI until a SOFn frame header is found."""
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b"\xff":
+            byte = f.read(1)
+        while byte == b"\xff":
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            continue  # Standalone markers without a length field
+        header = f.read(2)
+        if len(header) != 2:
+            return None
+        (length,) = struct.unpack(">H", header)
+        if marker in _JPEG_SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) != 5:
+                return None
+            _precision, height, width = struct.unpack(">BHH", frame)
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _webp_dimensions(head: bytes) -> tuple[int, int] | None:
+    """Read canvas size from the first chunk of a RIFF/WebP header."""
+    chunk = head[12:16]
+    if chunk == b"VP8X":
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return width, height
+    if chunk == b"VP8L" and head[20] == 0x2F:
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8 " and head[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    return None
+
+
+def _is_dct_scale(width: int, height: int, new_width: int, new_height: int) -> bool:
+    """Return ``True`` if a JPEG IDCT scale of 1/2, 1/4 or 1/8 maps the source exactly onto the target."""
+    return any((width, height) == (new_width * scale, new_height * scale) for scale in (2, 4, 8))
+
+
+def _is_srgb(icc_profile: bytes) -> bool:
+    """Return ``True`` if ``icc_profile`` describes sRGB, so dropping it keeps the colours."""
+    try:
+        description = ImageCms.ImageCmsProfile(io.BytesIO(icc_profile)).profile.profile_description
+    except (ImageCms.PyCMSError, OSError, TypeError):
+        return False
+    return "srgb" in (description or "").lower()
+
+
+def _strip_metadata(img: Image.Image) -> Image.Image:
+    """Return ``img`` without EXIF, XMP and sRGB ICC data.
+
+    The EXIF orientation is applied to the pixels first, so rotated photos
+    still display upright. Other ICC profiles are kept, as dropping them
+    would shift the colours.
+    """
+    if img.getexif().get(_EXIF_ORIENTATION, 1) != 1:
+        img = ImageOps.exif_transpose(img)
+    for key in ("exif", "xmp", "XML:com.adobe.xmp"):
+        img.info.pop(key, None)
+    icc_profile = img.info.get("icc_profile")
+    if icc_profile and _is_srgb(icc_profile):
+        del img.info["icc_profile"]
+    return img
+
+
+def _fast_dimensions(path: Path) -> tuple[str, tuple[int, int]]:
+    """Return the Pillow format name and ``(width, height)`` of an image by parsing only its header.
+
+    JPEG, PNG and WebP sizes are read straight from the SOF/IHDR/VP8* chunks
+    without creating a Pillow image. Other formats fall back to
+    :func:`PIL.Image.open`, which is lazy and reads only the header as well.
+    """
+    with path.open("rb") as f:
+        head = f.read(32)
+        size: tuple[int, int] | None = None
+        if head.startswith(b"\xff\xd8"):
+            image_format, size = "JPEG", _jpeg_dimensions(f)
+        elif head.startswith(_PNG_SIGNATURE) and head[12:16] == b"IHDR":
+            image_format, size = "PNG", cast(tuple[int, int], struct.unpack(">II", head[16:24]))
+        elif len(head) >= 30 and head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            image_format, size = "WEBP", _webp_dimensions(head)
+    if size is not None:
+        return image_format, size
+    with Image.open(path) as img:
+        return img.format or "", img.size
+
+
+# ``(saved_path, src_path, profile_name, condition_results, error)``
+CompressionResult = tuple[Path | None, Path, str, dict[str, dict[str, bool]], str | None]
+# ``(total_files, compressed_files, compressed_paths, failed_files, profile_results)``
+DirectoryResult = tuple[
+    int,
+    int,
+    list[Path],
+    list[tuple[Path, str]],
+    list[tuple[Path, Path, str, dict[str, dict[str, bool]]]],
+]
+
+
+class _BackgroundWriter:
+    """Write encoded images on a dedicated thread.
+
+    The queue is bounded so that encoding cannot run arbitrarily far ahead of
+    the disk. Items are processed in order, so timestamps queued after a write
+    are applied to the finished file.
+    """
+
+    def __init__(self, maxsize: int = 32) -> None:
+        self._queue: queue.Queue[tuple[Path, bytes | None, os.stat_result | None] | None] = queue.Queue(maxsize=maxsize)
+        self._errors: dict[Path, OSError] = {}
+        self._thread = threading.Thread(target=self._run, name="image-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, path: Path, data: bytes) -> None:
+        self._queue.put((path, data, None))
+
+    def copy_times(self, src_stat: os.stat_result, path: Path) -> None:
+        self._queue.put((path, None, src_stat))
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            path, data, src_stat = item
+            try:
+                if data is not None:
+                    path.write_bytes(data)
+                if src_stat is not None and path not in self._errors:
+                    copy_times_from_stat(src_stat, path)
+            except OSError as e:
+                logger.error(f"Error writing {path}: {e}")
+                if data is not None:
+                    self._errors[path] = e
+
+    def close(self) -> dict[Path, OSError]:
+        """Wait until all queued files are written.
+
+        Returns:
+            The error of every file that could not be written, by path.
+            Failing to copy timestamps is only logged.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        return self._errors
+
 
 class ImageCompressor:
     """Handles image compression with various parameters."""
@@ -42,6 +256,9 @@ class ImageCompressor:
         unsupported_dir: Path | None = None,
         output_format: str = "JPEG",
         num_workers: int = os.cpu_count() or 1,
+        skip_unchanged: bool = False,
+        external_encoders: bool = False,
+        strip_metadata: bool = False,
     ):
         """
         Initialize the image compressor.
@@ -54,8 +271,14 @@ class ImageCompressor:
             copy_unsupported: Whether to copy unsupported files
             unsupported_dir: Optional directory for unsupported files
             output_format: Output format ('JPEG', 'WebP', 'AVIF')
-            num_workers: Number of worker threads for parallel processing.
+            num_workers: Number of worker processes for parallel processing.
                 Defaults to the number of CPU cores.
+            skip_unchanged: Copy files that already have the output format and
+                need no resizing instead of re-encoding them.
+            external_encoders: Encode AVIF/WebP with ``avifenc``/``cwebp`` when
+                they are on ``PATH``, falling back to Pillow otherwise.
+            strip_metadata: Drop EXIF, XMP and sRGB ICC profiles from the output.
+                The EXIF orientation is applied to the pixels first.
         """
         self.quality = max(1, min(100, quality))
         self.max_largest_side = max_largest_side
@@ -65,12 +288,57 @@ class ImageCompressor:
         self.unsupported_dir = unsupported_dir
         self.output_format = output_format.upper()
         self.num_workers = max(1, num_workers)
+        self.skip_unchanged = skip_unchanged
+        self.external_encoders = external_encoders
+        self.strip_metadata = strip_metadata
+        # Set while images are spread over worker processes, so that external
+        # encoders use one thread each instead of competing for all cores
+        self._single_encoder_job = False
 
         # Store advanced parameters for each format
         self.jpeg_params: dict[str, Any] = {}
         self.webp_params: dict[str, Any] = {}
         self.avif_params: dict[str, Any] = {}
 
+        # Worker pool kept between calls while used as a context manager
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_workers = 0
+        self._keep_pool = False
+        # Background writer used while process_directory runs in one process
+        self._writer: _BackgroundWriter | None = None
+
+    def __enter__(self) -> "ImageCompressor":
+        self._keep_pool = True
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The compressor is pickled for every worker task; the pool stays here
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["_writer"] = None
+        return state
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one is running."""
+        self._keep_pool = False
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self, worker_count: int) -> ProcessPoolExecutor:
+        """Return a pool with ``worker_count`` processes, reusing the current one if possible."""
+        if self._pool is None or self._pool_workers != worker_count:
+            if self._pool is not None:
+                self._pool.shutdown()
+            # The pool is started from a thread of a multi-threaded Qt process,
+            # where fork() can deadlock the children
+            self._pool = ProcessPoolExecutor(max_workers=worker_count, mp_context=multiprocessing.get_context("spawn"))
+            self._pool_workers = worker_count
+        return self._pool
+
     def apply_profile(self, profile: CompressionProfile) -> None:
         """Apply settings from a compression profile to this compressor."""
         self.quality = profile.quality
@@ -88,6 +356,29 @@ class ImageCompressor:
         elif fmt == "AVIF":
             self.set_avif_parameters(**profile.advanced_params)
 
+    def _clone_with_profile(self, profile: CompressionProfile | None) -> "ImageCompressor":
+        """Return a copy of this compressor with ``profile`` applied."""
+        clone = ImageCompressor(
+            quality=self.quality,
+            max_largest_side=self.max_largest_side,
+            max_smallest_side=self.max_smallest_side,
+            preserve_structure=self.preserve_structure,
+            copy_unsupported=self.copy_unsupported,
+            unsupported_dir=self.unsupported_dir,
+            output_format=self.output_format,
+            skip_unchanged=self.skip_unchanged,
+            external_encoders=self.external_encoders,
+            strip_metadata=self.strip_metadata,
+        )
+        clone._single_encoder_job = self._single_encoder_job
+        clone._writer = self._writer
+        clone.set_jpeg_parameters(**self.jpeg_params)
+        clone.set_webp_parameters(**self.webp_params)
+        clone.set_avif_parameters(**self.avif_params)
+        if profile:
+            clone.apply_profile(profile)
+        return clone
+
     def set_jpeg_parameters(self, **kwargs: Any) -> None:
         """Set JPEG-specific compression parameters."""
         self.jpeg_params = kwargs
@@ -100,6 +391,47 @@ class ImageCompressor:
         """Set AVIF-specific compression parameters."""
         self.avif_params = kwargs
 
+    def _plan_resize(self, width: int, height: int) -> tuple[int, int]:
+        """Return the target size for a ``width`` x ``height`` image.
+
+        The result equals the input size when no resizing is required.
+        """
+        largest_side = max(width, height)
+        smallest_side = min(width, height)
+        new_width, new_height = width, height
+
+        if self.max_largest_side is not None and largest_side > self.max_largest_side:
+            # Scale down proportionally
+            scale_factor = self.max_largest_side / largest_side
+            new_width = int(width * scale_factor)
+            new_height = int(height * scale_factor)
+
+        if self.max_smallest_side is not None and smallest_side > self.max_smallest_side:
+            # Check if we need to scale down further
+            current_smallest = min(new_width, new_height)
+            if current_smallest > self.max_smallest_side:
+                scale_factor = self.max_smallest_side / current_smallest
+                new_width = int(new_width * scale_factor)
+                new_height = int(new_height * scale_factor)
+
+        return new_width, new_height
+
+    def should_compress_image(self, image_path: Path) -> bool:
+        """Return ``True`` if ``image_path`` has to be resized or re-encoded.
+
+        This is the decision :meth:`_compress_open_image` makes, taken before
+        the image is decoded. Unless ``skip_unchanged`` is set every image is
+        re-encoded, so the file is not touched at all. Otherwise the suffix is
+        checked first and only files already in the output format are probed
+        with :func:`_fast_dimensions`, which reads just the header.
+        """
+        if not self.skip_unchanged or self.strip_metadata:
+            return True
+        if image_path.suffix.lower() not in _FORMAT_SUFFIXES.get(self.output_format, ()):
+            return True
+        image_format, size = _fast_dimensions(image_path)
+        return image_format != self.output_format or self._plan_resize(*size) != size
+
     def compress_image(
         self,
         input_path: Path,
@@ -132,30 +464,39 @@ class ImageCompressor:
         """Core implementation for :meth:`compress_image` working on an open image."""
         # Calculate new dimensions
         width, height = img.size
-        largest_side = max(width, height)
-        smallest_side = min(width, height)
-
-        # Determine if resizing is needed
-        new_width, new_height = width, height
+        new_width, new_height = self._plan_resize(width, height)
 
-        if self.max_largest_side is not None and largest_side > self.max_largest_side:
-            # Scale down proportionally
-            scale_factor = self.max_largest_side / largest_side
-            new_width = int(width * scale_factor)
-            new_height = int(height * scale_factor)
-
-        if self.max_smallest_side is not None and smallest_side > self.max_smallest_side:
-            # Check if we need to scale down further
-            current_smallest = min(new_width, new_height)
-            if current_smallest > self.max_smallest_side:
-                scale_factor = self.max_smallest_side / current_smallest
-                new_width = int(new_width * scale_factor)
-                new_height = int(new_height * scale_factor)
+        if (
+            self.skip_unchanged
+            and not self.strip_metadata
+            and img.format == self.output_format
+            and (new_width, new_height) == (width, height)
+        ):
+            # Nothing to resize or transcode: keep the source bytes as they are
+            return self._keep_source(input_path, output_path)
 
         # Resize image if needed
         if new_width != width or new_height != height:
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            logger.info(f"Resized {input_path.name} from {width}x{height} to {new_width}x{new_height}")
+            if img.format == "JPEG":
+                # Let libjpeg scale by 1/2, 1/4 or 1/8 during decoding. When that
+                # lands exactly on the target the IDCT does the whole resize;
+                # otherwise the 2x margin keeps enough detail for LANCZOS
+                margin = 1 if _is_dct_scale(width, height, new_width, new_height) else 2
+                img.draft("RGB", (new_width * margin, new_height * margin))
+            src_width, src_height = img.size  # Already reduced by draft()
+            factor = src_width // max(new_width, 1)
+            if (src_width, src_height) == (new_width * factor, new_height * factor):
+                # Exact integer ratio: the box filter alone yields the target size
+                if factor > 1:
+                    img = img.reduce(factor)
+            else:
+                # reducing_gap box-reduces large ratios with Image.reduce() first,
+                # so LANCZOS only convolves a buffer about twice the target size
+                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+            logger.debug(f"Resized {input_path.name} from {width}x{height} to {new_width}x{new_height}")
+
+        if self.strip_metadata:
+            img = _strip_metadata(img)
 
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -170,12 +511,28 @@ class ImageCompressor:
         # Fallback to basic Pillow saving
         return self._save_basic(img, output_path)
 
+    @staticmethod
+    def _keep_source(input_path: Path, output_path: Path) -> Path:
+        """Copy ``input_path`` to ``output_path`` without re-encoding it."""
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(input_path, output_path)
+        logger.debug(f"Copied without re-encoding: {input_path.name} -> {output_path.name}")
+        return output_path
+
+    @contextmanager
+    def _open_output(self, output_path: Path) -> Iterator[Path | BinaryIO]:
+        """Yield the save target: ``output_path`` or a buffer for the background writer."""
+        if self._writer is None:
+            yield output_path
+            return
+        buffer = io.BytesIO()
+        yield buffer
+        self._writer.write(output_path, buffer.getvalue())
+
     def _save_jpeg_custom(self, img: Image.Image, input_path: Path, output_path: Path) -> Path | None:
         """Save image using custom JPEG save function."""
         try:
-            # Convert to RGB if necessary
-            if img.mode != "RGB":
-                img = img.convert("RGB")
+            # Mode conversion and alpha flattening happen in save_jpeg
 
             # Prepare parameters
             params = {
@@ -188,8 +545,9 @@ class ImageCompressor:
             }
 
             # Call custom save function
-            save_jpeg(img, output_path, **params)
-            logger.info(f"Compressed JPEG: {input_path.name} -> {output_path.name}")
+            with self._open_output(output_path) as dst:
+                save_jpeg(img, dst, **params)
+            logger.debug(f"Compressed JPEG: {input_path.name} -> {output_path.name}")
             return output_path
 
         except Exception as e:
@@ -203,14 +561,23 @@ class ImageCompressor:
             params = {
                 "lossless": self.webp_params.get("lossless", False),
                 "quality": self.quality,
-                "method": self.webp_params.get("method", 4),
+                "method": self.webp_params.get("method", WEBP_DEFAULTS["method"]),
                 "alpha_quality": self.webp_params.get("alpha_quality", 100),
                 "exact": self.webp_params.get("exact", False),
             }
 
+            if self.external_encoders and CWEBP:
+                try:
+                    save_webp_cwebp(img, output_path, multithread=not self._single_encoder_job, **params)
+                    logger.debug(f"Compressed WebP (cwebp): {input_path.name} -> {output_path.name}")
+                    return output_path
+                except Exception as e:
+                    logger.warning(f"cwebp failed for {input_path.name}, falling back to Pillow: {e}")
+
             # Call custom save function
-            save_webp(img, output_path, **params)
-            logger.info(f"Compressed WebP: {input_path.name} -> {output_path.name}")
+            with self._open_output(output_path) as dst:
+                save_webp(img, dst, **params)
+            logger.debug(f"Compressed WebP: {input_path.name} -> {output_path.name}")
             return output_path
 
         except Exception as e:
@@ -223,8 +590,8 @@ class ImageCompressor:
             # Prepare parameters
             params = {
                 "quality": self.quality,
-                "subsampling": self.avif_params.get("subsampling", "4:2:0"),
-                "speed": self.avif_params.get("speed", 6),
+                "subsampling": self.avif_params.get("subsampling", AVIF_DEFAULTS["subsampling"]),
+                "speed": self.avif_params.get("speed", AVIF_DEFAULTS["speed"]),
                 "codec": self.avif_params.get("codec", "auto"),
                 "range_": self.avif_params.get("range", "full"),
                 "qmin": self.avif_params.get("qmin", -1),
@@ -234,11 +601,29 @@ class ImageCompressor:
                 "tile_cols_log2": self.avif_params.get("tile_cols", 0),
             }
 
+            if self.external_encoders and AVIFENC:
+                try:
+                    save_avif_avifenc(
+                        img,
+                        output_path,
+                        quality=params["quality"],
+                        subsampling=params["subsampling"],
+                        speed=params["speed"],
+                        codec=params["codec"],
+                        range_=params["range_"],
+                        jobs="1" if self._single_encoder_job else "all",
+                    )
+                    logger.debug(f"Compressed AVIF (avifenc): {input_path.name} -> {output_path.name}")
+                    return output_path
+                except Exception as e:
+                    logger.warning(f"avifenc failed for {input_path.name}, falling back to Pillow: {e}")
+
             # Call custom save function
             # Note: range_ is renamed to range in the function call
             avif_params = params.copy()
-            save_avif(img, output_path, **avif_params)
-            logger.info(f"Compressed AVIF: {input_path.name} -> {output_path.name}")
+            with self._open_output(output_path) as dst:
+                save_avif(img, dst, **avif_params)
+            logger.debug(f"Compressed AVIF: {input_path.name} -> {output_path.name}")
             return output_path
 
         except Exception as e:
@@ -249,18 +634,29 @@ class ImageCompressor:
         """Fallback to basic Pillow saving."""
         try:
             # Convert to RGB if necessary (for JPEG output)
-            if output_path.suffix.lower() in {".jpg", ".jpeg"} and img.mode != "RGB":
+            if output_path.suffix.lower() in {".jpg", ".jpeg"} and img.mode not in {"RGB", "L", "CMYK"}:
                 img = img.convert("RGB")
 
             # Save with appropriate settings based on output format
             if self.output_format == "JPEG":
                 img.save(output_path, "JPEG", quality=self.quality, optimize=True)
             elif self.output_format == "WEBP":
-                img.save(output_path, "WEBP", quality=self.quality)
+                img.save(
+                    output_path,
+                    "WEBP",
+                    quality=self.quality,
+                    method=self.webp_params.get("method", WEBP_DEFAULTS["method"]),
+                )
             elif self.output_format == "AVIF":
                 # AVIF support requires pillow-avif-plugin
                 try:
-                    img.save(output_path, "AVIF", quality=self.quality)
+                    img.save(
+                        output_path,
+                        "AVIF",
+                        quality=self.quality,
+                        speed=self.avif_params.get("speed", AVIF_DEFAULTS["speed"]),
+                        subsampling=self.avif_params.get("subsampling", AVIF_DEFAULTS["subsampling"]),
+                    )
                 except Exception:
                     # Fallback to JPEG if AVIF fails
                     logger.warning(f"AVIF save failed, falling back to JPEG for {output_path.name}")
@@ -270,7 +666,7 @@ class ImageCompressor:
                 # Fallback to JPEG
                 img.save(output_path, "JPEG", quality=self.quality, optimize=True)
 
-            logger.info(f"Compressed (basic): {output_path.name}")
+            logger.debug(f"Compressed (basic): {output_path.name}")
             return output_path
 
         except Exception as e:
@@ -285,31 +681,36 @@ class ImageCompressor:
             return ".avif"
         return ".jpg"  # Default fallback
 
-    def _copy_to_unsupported(
+    def _unsupported_candidate(self, src: Path, input_root: Path, output_root: Path) -> Path:
+        """Return the path ``src`` is copied to when no name collision occurs."""
+        target_root = self.unsupported_dir or output_root
+        if self.preserve_structure:
+            return target_root / src.relative_to(input_root)
+        return target_root / src.name
+
+    def _unsupported_target(
         self,
         src: Path,
         input_root: Path,
         output_root: Path,
-        used_names: set[Path],
-        unsupported_used_names: set[Path],
+        taken: dict[Path, set[str]],
     ) -> Path:
-        """Copy ``src`` to the unsupported directory preserving timestamps."""
+        """Return the path in the unsupported directory reserved for ``src``.
+
+        ``taken`` maps a target directory to the file names already used in
+        it and is filled from the directory listing on first use.
+        """
         target_root = self.unsupported_dir or output_root
-        used_set = used_names if target_root == output_root else unsupported_used_names
         if self.preserve_structure:
-            rel_path = src.relative_to(input_root)
-            output_file = target_root / rel_path
-        else:
-            output_file = target_root / src.name
-            counter = 1
-            while output_file in used_set or output_file.exists():
-                output_file = target_root / f"{src.stem}_{counter}{src.suffix}"
-                counter += 1
-            used_set.add(output_file)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copyfile(src, output_file)
-        copy_times_from_src(src, output_file)
-        return output_file
+            return self._unsupported_candidate(src, input_root, output_root)
+        names = _taken_names(target_root, taken)
+        name = src.name
+        counter = 1
+        while name in names:
+            name = f"{src.stem}_{counter}{src.suffix}"
+            counter += 1
+        names.add(name)
+        return target_root / name
 
     def process_directory(
         self,
@@ -321,19 +722,30 @@ class ImageCompressor:
         log_callback: Callable[[str], None] | None = None,
         num_workers: int | None = None,
         stop_event: Event | None = None,
-    ) -> tuple[
-        int,
-        int,
-        list[Path],
-        list[tuple[Path, str]],
-        list[tuple[Path, Path, str, dict[str, dict[str, bool]]]],
-    ]:
+        prefetch: bool = False,
+        reuse: dict[str, dict[str, Any]] | None = None,
+        *,
+        copied_files: list[tuple[Path, Path]] | None = None,
+    ) -> DirectoryResult:
         """
         Process a directory recursively, compressing all supported images.
 
         Args:
             input_root: Root input directory
             output_root: Root output directory
+            prefetch: Read the next image in a background thread while the
+                current one is compressed. Helps on slow or network storage
+                and only applies when running in a single process.
+            reuse: Pairs of an earlier run into ``output_root`` as returned by
+                :func:`previous_outputs`. Images whose size and modification
+                time still match keep their previous output instead of being
+                encoded again, and unsupported files are copied over their
+                recorded copy. Outputs of changed sources that this run writes
+                under a different name are removed. When given,
+                ``output_root`` may already exist.
+            copied_files: Filled with ``(src_path, copy_path)`` for every
+                unsupported or failed file copied or kept by this run, to be
+                passed on to :func:`save_compression_settings`.
 
         Returns:
             Tuple of ``(total_files, compressed_files, compressed_paths,
@@ -342,7 +754,8 @@ class ImageCompressor:
             contains tuples ``(src_path, output_path, profile_name,
             condition_results)`` for successfully compressed images.
         """
-        total_files = sum(1 for f in input_root.rglob("*") if f.is_file() and f.suffix.lower() in SUPPORTED_EXTENSIONS)
+        entries = list(iter_files(input_root))
+        total_files = sum(1 for entry in entries if lower_suffix(entry.name) in SUPPORTED_EXTENSIONS)
         processed_files = 0
         compressed_files = 0
         compressed_paths: list[Path] = []
@@ -352,163 +765,188 @@ class ImageCompressor:
         if progress_callback:
             progress_callback(0, total_files)
 
-        # Ensure output directory does not already exist
-        if output_root.exists():
+        # Ensure output directory does not already exist, unless it is updated
+        if reuse is None and output_root.exists():
             raise FileExistsError(f"Output directory {output_root} already exists")
-        output_root.mkdir(parents=True)
+        output_root.mkdir(parents=True, exist_ok=True)
 
         worker_count = max(1, num_workers or self.num_workers)
-
-        tasks: list[Path] = []
-        used_names: set[Path] = set()
-        unsupported_used_names: set[Path] = set()
-
-        def _clone_with_profile(profile: CompressionProfile | None) -> "ImageCompressor":
-            clone = ImageCompressor(
-                quality=self.quality,
-                max_largest_side=self.max_largest_side,
-                max_smallest_side=self.max_smallest_side,
-                preserve_structure=self.preserve_structure,
-                copy_unsupported=self.copy_unsupported,
-                unsupported_dir=self.unsupported_dir,
-                output_format=self.output_format,
-            )
-            clone.set_jpeg_parameters(**self.jpeg_params)
-            clone.set_webp_parameters(**self.webp_params)
-            clone.set_avif_parameters(**self.avif_params)
-            if profile:
-                clone.apply_profile(profile)
-            return clone
-
-        used_names_lock = Lock()
-
-        # Prepare tasks and copy non-image files
-        for file_path in input_root.rglob("*"):
-            if stop_event and stop_event.is_set():
-                break
-            if not file_path.is_file():
-                continue
-
-            if file_path.suffix.lower() in SUPPORTED_EXTENSIONS:
-                tasks.append(file_path)
-            else:
-                if self.copy_unsupported:
-                    self._copy_to_unsupported(
-                        file_path,
-                        input_root,
-                        output_root,
-                        used_names,
-                        unsupported_used_names,
-                    )
-                    msg = tr("Copied file: {name}").format(name=file_path.name)
+        self._single_encoder_job = worker_count > 1
+
+        tasks: list[tuple[Path, Path]] = []
+        # File names per flat target directory; collisions are resolved in memory
+        taken: dict[Path, set[str]] = {}
+        used_stems: set[str] = set()
+
+        # Unchanged images keep their previous output; their names are
+        # reserved before new images are named
+        kept: list[CompressionResult] = []
+        kept_sources: set[Path] = set()
+        if reuse:
+            for entry in entries:
+                src = Path(entry.path)
+                pair = reuse.get(str(src))
+                if pair is not None and "compressed" in pair and _is_unchanged(entry, pair):
+                    saved = Path(pair["compressed"])
+                    kept.append((saved, src, pair.get("profile", ""), pair.get("conditions", {}), None))
+                    kept_sources.add(src)
+                    used_stems.add(saved.stem)
+
+        # Copies are I/O bound and release the GIL, so they run in threads while
+        # the tree is scanned and images are compressed. Target names are still
+        # reserved synchronously.
+        copy_futures: list[Future[Path]] = []
+        copied: list[tuple[Path, Path]] = []
+        with ThreadPoolExecutor(max_workers=8) as io_pool:
+
+            def _copy_unsupported(src: Path, entry: os.DirEntry[str] | None = None) -> None:
+                # The scanned entry caches its stat for both the check and the copy
+                source = entry if entry is not None else src
+                previous = reuse.get(str(src)) if reuse else None
+                if previous is not None and previous.get("copied"):
+                    # Replace the recorded copy instead of adding one under a new name
+                    target = Path(previous["copied"])
+                    _taken_names(target.parent, taken).add(target.name)
                 else:
-                    msg = tr("Skipped unsupported file: {name}").format(name=file_path.name)
-
-                logger.info(msg)
-                if log_callback:
-                    log_callback(msg)
-
-        def _compress_task(
-            src: Path,
-        ) -> tuple[Path | None, Path, str, dict[str, dict[str, bool]], str | None]:
-            try:
-                with Image.open(src) as img:
-                    if profiles:
-                        profile, cond_results = cast(
-                            tuple[CompressionProfile | None, dict[str, dict[str, bool]]],
-                            select_profile(img, profiles, return_condition_results=True),
-                        )
+                    candidate = self._unsupported_candidate(src, input_root, output_root)
+                    # Settings files of older runs do not record their copies
+                    if reuse is not None and _is_same_copy(source, candidate):
+                        target = candidate
                     else:
-                        profile, cond_results = None, {}
-                    comp = _clone_with_profile(profile)
-                    new_extension = comp._get_extension_according_format()
-                    if comp.preserve_structure:
-                        rel_path = src.relative_to(input_root)
-                        output_file = output_root / rel_path
-                        output_file = output_file.with_suffix(new_extension)
+                        target = self._unsupported_target(src, input_root, output_root, taken)
+                copied.append((src, target))
+                if reuse is not None and _is_same_copy(source, target):
+                    return  # Copied by the earlier run and unchanged since
+                copy_futures.append(io_pool.submit(_copy_with_times, source, target))
+
+            # Prepare tasks and copy non-image files
+            for entry in entries:
+                if stop_event and stop_event.is_set():
+                    break
+                file_path = Path(entry.path)
+
+                if file_path in kept_sources:
+                    continue
+                if lower_suffix(entry.name) in SUPPORTED_EXTENSIONS:
+                    # The final extension depends on the profile picked by the worker,
+                    # so only the stem is reserved here and the suffix is replaced later.
+                    if self.preserve_structure:
+                        output_file = output_root / file_path.relative_to(input_root)
                     else:
-                        base_name = src.stem
+                        stem = file_path.stem
                         counter = 1
-                        with used_names_lock:
-                            output_file = output_root / f"{base_name}{new_extension}"
-                            while output_file in used_names or output_file.exists():
-                                output_file = output_root / f"{base_name}_{counter}{new_extension}"
-                                counter += 1
-                            used_names.add(output_file)
-
-                    saved, error = comp.compress_image(src, output_file, img)
-                    profile_name = profile.name if profile else tr("Default")
-                if saved:
-                    copy_times_from_src(src, saved)
-                return saved, src, profile_name, cond_results, error
-            except Exception as e:  # Handle errors opening the image
-                logger.exception(f"Error processing {src}: {e}")
-                return None, src, tr("Default"), {}, str(e)
-
-        if worker_count > 1:
-            with ThreadPoolExecutor(max_workers=worker_count) as executor:
-                future_to_file = [executor.submit(_compress_task, s) for s in tasks]
-                for future in as_completed(future_to_file):
-                    if stop_event and stop_event.is_set():
-                        executor.shutdown(wait=False, cancel_futures=True)
-                        break
-                    saved_path, src_file, profile_name, cond_results, error = future.result()
-                    if saved_path:
-                        compressed_files += 1
-                        compressed_paths.append(saved_path)
-                        profile_results.append((src_file, saved_path, profile_name, cond_results))
-                        msg = tr("Successfully compressed: {name} with profile {profile}").format(
-                            name=src_file.name, profile=profile_name
-                        )
-                        logger.info(msg)
+                        while stem in used_stems:
+                            stem = f"{file_path.stem}_{counter}"
+                            counter += 1
+                        used_stems.add(stem)
+                        output_file = output_root / f"{stem}{file_path.suffix}"
+                    tasks.append((file_path, output_file))
+                else:
+                    if self.copy_unsupported:
+                        _copy_unsupported(file_path, entry)
+                        msg = tr("Copied file: {name}").format(name=file_path.name)
                     else:
-                        failed_files.append((src_file, error or ""))
-                        if self.copy_unsupported:
-                            self._copy_to_unsupported(
-                                src_file,
-                                input_root,
-                                output_root,
-                                used_names,
-                                unsupported_used_names,
-                            )
-                        msg = tr("Failed to compress: {name}").format(name=src_file.name)
-                        logger.warning(msg)
+                        msg = tr("Skipped unsupported file: {name}").format(name=file_path.name)
+
+                    logger.debug(msg)
                     if log_callback:
                         log_callback(msg)
-                    processed_files += 1
-                    if progress_callback:
-                        progress_callback(processed_files, total_files)
-        else:
-            for src in tasks:
-                if stop_event and stop_event.is_set():
-                    break
-                saved_path, src_file, profile_name, cond_results, error = _compress_task(src)
+
+            def _handle_result(result: CompressionResult, reused: bool = False) -> None:
+                nonlocal compressed_files, processed_files
+                saved_path, src_file, profile_name, cond_results, error = result
                 if saved_path:
                     compressed_files += 1
                     compressed_paths.append(saved_path)
+                    taken.setdefault(saved_path.parent, set()).add(saved_path.name)
                     profile_results.append((src_file, saved_path, profile_name, cond_results))
-                    msg = tr("Successfully compressed: {name} with profile {profile}").format(
-                        name=src.name, profile=profile_name
-                    )
-                    logger.info(msg)
+                    if reused:
+                        msg = tr("Unchanged, kept previous output: {name}").format(name=src_file.name)
+                    else:
+                        msg = tr("Successfully compressed: {name} with profile {profile}").format(
+                            name=src_file.name, profile=profile_name
+                        )
+                    logger.debug(msg)
                 else:
-                    failed_files.append((src, error or ""))
+                    failed_files.append((src_file, error or ""))
                     if self.copy_unsupported:
-                        self._copy_to_unsupported(
-                            src,
-                            input_root,
-                            output_root,
-                            used_names,
-                            unsupported_used_names,
-                        )
-                    msg = tr("Failed to compress: {name}").format(name=src.name)
+                        _copy_unsupported(src_file)
+                    msg = tr("Failed to compress: {name}").format(name=src_file.name)
                     logger.warning(msg)
                 if log_callback:
                     log_callback(msg)
                 processed_files += 1
+                if processed_files % _LOG_EVERY == 0 or processed_files == total_files:
+                    # Per-file messages are debug-level; a summary keeps the log readable
+                    logger.info(f"Compressed {compressed_files}/{total_files} files, current: {src_file.name}")
                 if progress_callback:
                     progress_callback(processed_files, total_files)
 
+            for result in kept:
+                _handle_result(result, reused=True)
+
+            if worker_count > 1:
+                executor = self._get_pool(worker_count)
+                try:
+                    futures = [executor.submit(_compress_one, self, src, dst, profiles) for src, dst in tasks]
+                    for future in as_completed(futures):
+                        if stop_event and stop_event.is_set():
+                            for pending_future in futures:
+                                pending_future.cancel()
+                            break
+                        _handle_result(future.result())
+                finally:
+                    if not self._keep_pool:
+                        self.close()
+            else:
+                # In a single process, files are written by a background thread so
+                # that encoding the next image overlaps with writing the last one.
+                # Pool workers write their own files in parallel anyway.
+                self._writer = _BackgroundWriter()
+                write_errors: dict[Path, OSError] = {}
+                try:
+                    if prefetch and tasks:
+                        with ThreadPoolExecutor(max_workers=1) as reader:
+                            pending = reader.submit(_prefetch, tasks[0][0])
+                            for index, (src, dst) in enumerate(tasks):
+                                if stop_event and stop_event.is_set():
+                                    break
+                                data = pending.result()
+                                if index + 1 < len(tasks):
+                                    pending = reader.submit(_prefetch, tasks[index + 1][0])
+                                _handle_result(_compress_one(self, src, dst, profiles, data))
+                    else:
+                        for src, dst in tasks:
+                            if stop_event and stop_event.is_set():
+                                break
+                            _handle_result(_compress_one(self, src, dst, profiles))
+                finally:
+                    writer, self._writer = self._writer, None
+                    write_errors = writer.close()
+
+                # Results are handled when encoded, before the file is written
+                for unwritten_result in [r for r in profile_results if r[1] in write_errors]:
+                    unwritten_src, unwritten = unwritten_result[0], unwritten_result[1]
+                    profile_results.remove(unwritten_result)
+                    compressed_paths.remove(unwritten)
+                    compressed_files -= 1
+                    failed_files.append((unwritten_src, str(write_errors[unwritten])))
+                    if self.copy_unsupported:
+                        _copy_unsupported(unwritten_src)
+                    msg = tr("Failed to compress: {name}").format(name=unwritten_src.name)
+                    logger.warning(msg)
+                    if log_callback:
+                        log_callback(msg)
+
+        for copy_future in copy_futures:
+            copy_future.result()  # Re-raise copy errors
+
+        if reuse:
+            outputs = [(src_file, saved_path) for src_file, saved_path, _, _ in profile_results]
+            _remove_replaced_outputs(reuse, [*outputs, *copied])
+        if copied_files is not None:
+            copied_files.extend(copied)
+
         msg = tr("Compression complete: {compressed}/{total} files processed").format(
             compressed=compressed_files, total=total_files
         )
@@ -517,6 +955,35 @@ class ImageCompressor:
             status_callback(msg)
         return total_files, compressed_files, compressed_paths, failed_files, profile_results
 
+    def process_directories(
+        self,
+        jobs: Sequence[tuple[Path, Path]],
+        profiles: Sequence[CompressionProfile] | None = None,
+        num_workers: int | None = None,
+        stop_event: Event | None = None,
+    ) -> list[DirectoryResult]:
+        """Process several ``(input_root, output_root)`` pairs with one worker pool.
+
+        The pool is created once and shared by all directories instead of
+        being started and torn down for each of them.
+        """
+        results: list[DirectoryResult] = []
+        keep_pool = self._keep_pool
+        self._keep_pool = True
+        try:
+            for input_root, output_root in jobs:
+                if stop_event and stop_event.is_set():
+                    break
+                results.append(
+                    self.process_directory(
+                        input_root, output_root, profiles, num_workers=num_workers, stop_event=stop_event
+                    )
+                )
+        finally:
+            if not keep_pool:
+                self.close()
+        return results
+
     def get_compression_stats(
         self,
         input_dir: Path,
@@ -528,18 +995,23 @@ class ImageCompressor:
         try:
             failed_set = {f.resolve() for f in failed_files or []}
 
-            input_files = [
-                f
-                for f in input_dir.rglob("*")
-                if f.is_file() and f.suffix.lower() in SUPPORTED_EXTENSIONS and f.resolve() not in failed_set
-            ]
+            # DirEntry.stat() reuses data from the directory listing where possible
+            input_size = sum(
+                entry.stat().st_size
+                for entry in iter_files(input_dir)
+                if lower_suffix(entry.name) in SUPPORTED_EXTENSIONS
+                and (not failed_set or Path(entry.path).resolve() not in failed_set)
+            )
 
             if compressed_paths is not None:
-                output_size = sum(p.stat().st_size for p in compressed_paths if p.exists())
+                output_size = 0
+                for p in compressed_paths:
+                    try:
+                        output_size += p.stat().st_size
+                    except FileNotFoundError:
+                        continue
             else:
-                output_size = sum(f.stat().st_size for f in output_dir.rglob("*") if f.is_file())
-
-            input_size = sum(f.stat().st_size for f in input_files)
+                output_size = sum(entry.stat().st_size for entry in iter_files(output_dir))
 
             input_size_mb = input_size / (1024 * 1024)
             output_size_mb = output_size / (1024 * 1024)
@@ -562,6 +1034,186 @@ class ImageCompressor:
             }
 
 
+def _copy_with_times(src: Path | os.DirEntry[str], dst: Path) -> Path:
+    """Copy ``src`` to ``dst`` creating parent directories and keeping timestamps."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(src, dst)
+    copy_times_from_src(src, dst)
+    return dst
+
+
+def _taken_names(directory: Path, taken: dict[Path, set[str]]) -> set[str]:
+    """Return the names used in ``directory``, listing it on first use."""
+    names = taken.get(directory)
+    if names is None:
+        names = taken[directory] = set()
+        if directory.is_dir():
+            with os.scandir(directory) as it:
+                names.update(entry.name for entry in it)
+    return names
+
+
+def _remove_replaced_outputs(reuse: dict[str, dict[str, Any]], outputs: Sequence[tuple[Path, Path]]) -> None:
+    """Delete earlier outputs of the sources in ``outputs`` that were written under another name.
+
+    An earlier output is kept if this run wrote or kept any file at that
+    path, e.g. when another source took over the name in flattened mode.
+    """
+    produced = {dst for _, dst in outputs}
+    for src, _ in outputs:
+        previous = reuse.get(str(src))
+        if previous is None:
+            continue
+        old = previous.get("compressed") or previous.get("copied")
+        if old and Path(old) not in produced:
+            try:
+                Path(old).unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Could not remove previous output {old}: {e}")
+
+
+def _is_unchanged(entry: os.DirEntry[str], pair: dict[str, Any]) -> bool:
+    """Return ``True`` if the source of ``pair`` is unchanged and its output still exists."""
+    try:
+        st = entry.stat()
+    except OSError:
+        return False
+    return (
+        pair.get("original_size") == st.st_size
+        and pair.get("original_mtime_ns") == st.st_mtime_ns
+        and Path(pair["compressed"]).is_file()
+    )
+
+
+def _is_same_copy(src: Path | os.DirEntry[str], dst: Path) -> bool:
+    """Return ``True`` if ``dst`` is an unchanged copy made by :func:`_copy_with_times`."""
+    try:
+        src_st, dst_st = src.stat(), dst.stat()
+    except OSError:
+        return False
+    return (src_st.st_size, src_st.st_mtime_ns) == (dst_st.st_size, dst_st.st_mtime_ns)
+
+
+def _prefetch(path: Path) -> bytes | mmap.mmap | None:
+    """Read ``path`` ahead of time; errors are reported when it is opened.
+
+    Where ``MADV_WILLNEED`` is available the file is mapped and the kernel
+    reads it into the page cache in the background, so decoding needs no copy
+    into a ``bytes`` object. Elsewhere the contents are read.
+    """
+    try:
+        if hasattr(mmap, "MADV_WILLNEED") and path.stat().st_size:
+            with path.open("rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            mm.madvise(mmap.MADV_WILLNEED)
+            return mm
+        return path.read_bytes()
+    except (OSError, ValueError):
+        return None
+
+
+@contextmanager
+def _open_source(src: Path, size: int, data: bytes | mmap.mmap | None = None) -> Iterator[Image.Image]:
+    """Open ``src``, which is ``size`` bytes long, for compression.
+
+    Prefetched ``data`` is decoded from memory; a prefetched mapping is closed
+    afterwards. Large files are memory-mapped, so the decoder reads straight
+    from the page cache, which is shared by all worker processes. The mapping
+    stays open until the caller is done with the image.
+    """
+    if isinstance(data, mmap.mmap):
+        with data, Image.open(cast(BinaryIO, data)) as img:
+            yield img
+        return
+    if data is not None:
+        with Image.open(io.BytesIO(data)) as img:
+            yield img
+        return
+    if size < _MMAP_MIN_SIZE:
+        with Image.open(src) as img:
+            yield img
+        return
+    with src.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        with Image.open(cast(BinaryIO, mm)) as img:
+            yield img
+
+
+def _compress_one(
+    compressor: ImageCompressor,
+    src: Path,
+    output_file: Path,
+    profiles: Sequence[CompressionProfile] | None,
+    data: bytes | mmap.mmap | None = None,
+) -> CompressionResult:
+    """Select a profile for ``src`` and compress it next to ``output_file``.
+
+    Defined at module level so that it can be pickled and executed in a
+    :class:`~concurrent.futures.ProcessPoolExecutor` worker. ``output_file``
+    still carries the source suffix; it is replaced by the extension of the
+    selected output format. ``data`` holds the prefetched file contents,
+    if available.
+    """
+    try:
+        # One stat serves the mmap threshold, the file size condition and the
+        # copied timestamps
+        src_stat = src.stat()
+        selected: tuple[CompressionProfile | None, dict[str, dict[str, bool]]] | None = None
+        if compressor.skip_unchanged and _may_keep_source(compressor, src, profiles):
+            # Select the profile from the file header, so that files which are
+            # kept as they are never get decoded
+            selected = _select_profile(src, profiles, src_stat.st_size)
+            comp = compressor._clone_with_profile(selected[0])
+            if not comp.should_compress_image(src):
+                if isinstance(data, mmap.mmap):
+                    data.close()
+                kept = comp._keep_source(src, output_file.with_suffix(comp._get_extension_according_format()))
+                return kept, src, _profile_name(selected[0]), selected[1], None
+        with _open_source(src, src_stat.st_size, data) as img:
+            profile, cond_results = selected or _select_profile(img, profiles, src_stat.st_size)
+            comp = compressor._clone_with_profile(profile)
+            output_file = output_file.with_suffix(comp._get_extension_according_format())
+            saved, error = comp.compress_image(src, output_file, img)
+            profile_name = _profile_name(profile)
+        if saved:
+            if comp._writer is not None:
+                comp._writer.copy_times(src_stat, saved)  # Runs after the queued write
+            else:
+                copy_times_from_stat(src_stat, saved)
+        return saved, src, profile_name, cond_results, error
+    except Exception as e:  # Handle errors opening the image
+        logger.exception(f"Error processing {src}: {e}")
+        return None, src, tr("Default"), {}, str(e)
+
+
+def _may_keep_source(compressor: ImageCompressor, src: Path, profiles: Sequence[CompressionProfile] | None) -> bool:
+    """Return ``False`` if the suffix of ``src`` matches no output format ``src`` can get.
+
+    Such files are always re-encoded, so their header is not probed first.
+    """
+    formats = {compressor.output_format, *(profile.output_format.upper() for profile in profiles or ())}
+    return any(src.suffix.lower() in _FORMAT_SUFFIXES.get(fmt, ()) for fmt in formats)
+
+
+def _select_profile(
+    image: Path | Image.Image,
+    profiles: Sequence[CompressionProfile] | None,
+    file_size: int,
+) -> tuple[CompressionProfile | None, dict[str, dict[str, bool]]]:
+    """Return the profile selected for ``image`` and the condition results."""
+    if not profiles:
+        return None, {}
+    return cast(
+        tuple[CompressionProfile | None, dict[str, dict[str, bool]]],
+        select_profile(image, profiles, file_size=file_size, return_condition_results=True),
+    )
+
+
+def _profile_name(profile: CompressionProfile | None) -> str:
+    return profile.name if profile else tr("Default")
+
+
 def create_image_pairs(compressed_dir: Path, original_dir: Path | None = None) -> list[tuple[Path, Path]]:
     """
     Create pairs of original and compressed images for comparison.
@@ -581,50 +1233,45 @@ def create_image_pairs(compressed_dir: Path, original_dir: Path | None = None) -
     logger.info(f"Creating image pairs from compressed dir: {compressed_dir}")
     logger.info(f"Original dir: {original_dir}")
 
-    # Get all compressed image files
-    compressed_files = []
-    for file_path in compressed_dir.rglob("*"):
-        if file_path.is_file() and file_path.suffix.lower() in SUPPORTED_EXTENSIONS:
-            compressed_files.append(file_path)
+    # Walk both trees once; lookups below are then done in memory
+    compressed_files = [
+        Path(entry.path) for entry in iter_files(compressed_dir) if lower_suffix(entry.name) in SUPPORTED_EXTENSIONS
+    ]
+    original_files = [
+        Path(entry.path) for entry in iter_files(original_dir) if lower_suffix(entry.name) in SUPPORTED_EXTENSIONS
+    ]
+    original_set = set(original_files)
+    # Relative path without suffix and bare stem -> first matching original
+    by_rel_stem: dict[Path, Path] = {}
+    by_stem: dict[str, Path] = {}
+    for path in original_files:
+        by_rel_stem.setdefault(path.relative_to(original_dir).with_suffix(""), path)
+        by_stem.setdefault(path.stem, path)
 
     logger.info(f"Found {len(compressed_files)} compressed files")
 
     for compressed_file in compressed_files:
         try:
-            # Try to find corresponding original file
-            if original_dir:
-                # Calculate relative path from compressed file to compressed dir root
-                rel_path = compressed_file.relative_to(compressed_dir)
-
-                # Try to find original file at the same relative path
-                original_file = original_dir / rel_path
-
-                # If original file doesn't exist, try with different extensions
-                if not original_file.exists():
-                    # Try common image extensions
-                    for ext in SUPPORTED_EXTENSIONS:
-                        test_path = original_file.with_suffix(ext)
-                        if test_path.exists():
-                            original_file = test_path
-                            break
-
-                # If still not found and we're in flattened mode, search recursively
-                if not original_file.exists() and compressed_file.parent == compressed_dir:
-                    # Search recursively in original directory
-                    for search_file in original_dir.rglob(compressed_file.stem + "*"):
-                        if search_file.suffix.lower() in SUPPORTED_EXTENSIONS:
-                            original_file = search_file
-                            break
-
-                if original_file.exists():
-                    image_pairs.append((original_file, compressed_file))
-                    logger.info(f"Created pair: {original_file.name} <-> {compressed_file.name}")
-                else:
-                    logger.warning(f"Original file not found for: {compressed_file.name}")
-                    # Fallback: use compressed file for both
-                    image_pairs.append((compressed_file, compressed_file))
+            # Calculate relative path from compressed file to compressed dir root
+            rel_path = compressed_file.relative_to(compressed_dir)
+
+            # Try to find original file at the same relative path
+            original_file: Path | None = original_dir / rel_path
+            if original_file not in original_set:
+                # Same relative path with a different image extension
+                original_file = by_rel_stem.get(rel_path.with_suffix(""))
+
+            # If still not found and we're in flattened mode, search the whole tree
+            if original_file is None and compressed_file.parent == compressed_dir:
+                stem = compressed_file.stem
+                original_file = by_stem.get(stem) or next((f for f in original_files if f.name.startswith(stem)), None)
+
+            if original_file is not None:
+                image_pairs.append((original_file, compressed_file))
+                logger.debug(f"Created pair: {original_file.name} <-> {compressed_file.name}")
             else:
-                # No original directory, use compressed file for both
+                logger.warning(f"Original file not found for: {compressed_file.name}")
+                # Fallback: use compressed file for both
                 image_pairs.append((compressed_file, compressed_file))
 
         except Exception as e:
@@ -635,6 +1282,42 @@ def create_image_pairs(compressed_dir: Path, original_dir: Path | None = None) -
     return image_pairs
 
 
+def _pair_dict(pair: tuple[Path, Path] | tuple[Path, Path, str, dict[str, dict[str, bool]]]) -> dict[str, Any]:
+    """Convert an image pair to its JSON representation."""
+    if len(pair) == 2:
+        original_path, compressed_path = pair
+        profile_name = ""
+        cond_results: dict[str, dict[str, bool]] = {}
+    else:
+        original_path, compressed_path, profile_name, cond_results = pair
+    entry: dict[str, Any] = {
+        "original": str(original_path),
+        "compressed": str(compressed_path),
+        "original_name": original_path.name,
+        "compressed_name": compressed_path.name,
+        "profile": profile_name,
+        "conditions": cond_results,
+    }
+    return _with_source_stat(entry, original_path)
+
+
+def _copy_dict(copy: tuple[Path, Path]) -> dict[str, Any]:
+    """Convert a copied unsupported file to its JSON representation."""
+    original_path, copied_path = copy
+    return _with_source_stat({"original": str(original_path), "copied": str(copied_path)}, original_path)
+
+
+def _with_source_stat(entry: dict[str, Any], original_path: Path) -> dict[str, Any]:
+    # Lets a later run into the same directory skip unchanged sources
+    try:
+        st = original_path.stat()
+    except OSError:
+        return entry
+    entry["original_size"] = st.st_size
+    entry["original_mtime_ns"] = st.st_mtime_ns
+    return entry
+
+
 def save_compression_settings(
     output_dir: Path,
     compression_settings: dict[str, Any],
@@ -642,6 +1325,7 @@ def save_compression_settings(
     stats: dict[str, Any],
     failed_files: list[tuple[Path, str]] | None = None,
     conversion_time: str | None = None,
+    copied_files: Sequence[tuple[Path, Path]] | None = None,
 ) -> Path | None:
     """
     Save compression settings and image pairs to a JSON file.
@@ -655,30 +1339,15 @@ def save_compression_settings(
         failed_files: List of tuples ``(path, error)`` for images that failed to
             compress
         conversion_time: Human-readable duration of the compression process
+        copied_files: Tuples ``(original, copy)`` of unsupported and failed
+            files, so that a later update replaces the same copies
     """
     import json
     from datetime import datetime
 
     failed_files = failed_files or []
 
-    pair_entries = []
-    for pair in image_pairs:
-        if len(pair) == 2:
-            original_path, compressed_path = pair
-            profile_name = ""
-            cond_results: dict[str, dict[str, bool]] = {}
-        else:
-            original_path, compressed_path, profile_name, cond_results = pair
-        pair_entries.append(
-            {
-                "original": str(original_path),
-                "compressed": str(compressed_path),
-                "original_name": original_path.name,
-                "compressed_name": compressed_path.name,
-                "profile": profile_name,
-                "conditions": cond_results,
-            }
-        )
+    pair_entries = list(map(_pair_dict, image_pairs))
 
     settings_data = {
         "compression_settings": compression_settings,
@@ -686,6 +1355,7 @@ def save_compression_settings(
         "image_pairs": pair_entries,
         "total_pairs": len(image_pairs),
         "failed_files": [{"path": str(path), "error": error} for path, error in failed_files],
+        "copied_files": list(map(_copy_dict, copied_files or [])),
         "stats": stats,
     }
 
@@ -694,8 +1364,11 @@ def save_compression_settings(
 
     settings_file = output_dir / "compression_settings.json"
     try:
-        with settings_file.open("w") as f:
-            json.dump(settings_data, f, indent=2, ensure_ascii=False)
+        if HAS_ORJSON:
+            settings_file.write_bytes(orjson.dumps(settings_data, option=orjson.OPT_INDENT_2, default=str))
+        else:
+            with settings_file.open("w", encoding="utf-8") as f:
+                json.dump(settings_data, f, indent=2, ensure_ascii=False, default=str)
         logger.info(f"Compression settings saved to: {settings_file}")
         return settings_file
     except Exception as e:
@@ -703,6 +1376,27 @@ def save_compression_settings(
         return None
 
 
+def read_settings_file(settings_file: Path) -> dict:
+    """
+    Parse a compression settings file, raising on any error.
+
+    Settings files are written as UTF-8 and can list thousands of image
+    pairs, so they are parsed with orjson when it is installed.
+
+    Args:
+        settings_file: Path to the settings file
+
+    Returns:
+        Dictionary with settings data
+    """
+    import json
+
+    if HAS_ORJSON:
+        return cast(dict, orjson.loads(settings_file.read_bytes()))
+    with settings_file.open(encoding="utf-8") as f:
+        return cast(dict, json.load(f))
+
+
 def load_compression_settings(settings_file: Path) -> dict | None:
     """
     Load compression settings from a JSON file.
@@ -713,11 +1407,43 @@ def load_compression_settings(settings_file: Path) -> dict | None:
     Returns:
         Dictionary with settings data or None if failed
     """
-    import json
-
     try:
-        with settings_file.open() as f:
-            return json.load(f)
+        return read_settings_file(settings_file)
     except Exception as e:
         logger.error(f"Failed to load compression settings: {e}")
         return None
+
+
+def previous_outputs(output_dir: Path, compression_settings: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """
+    Return the image pairs of an earlier run into ``output_dir``, keyed by source path.
+
+    The pairs can only be reused if that run used the same settings, so an
+    empty mapping is returned when they differ or no settings file exists.
+
+    Args:
+        output_dir: Directory of the earlier run
+        compression_settings: Settings of the upcoming run
+
+    Returns:
+        Mapping of original path to its pair entry, or to its ``copied``
+        entry for unsupported and failed files
+    """
+    import json
+
+    settings_file = output_dir / "compression_settings.json"
+    if not settings_file.is_file():
+        return {}
+    data = load_compression_settings(settings_file)
+    if data is None:
+        return {}
+    # Compare the way the settings look after being written to JSON
+    current = json.loads(json.dumps(compression_settings, default=str))
+    if data.get("compression_settings") != current:
+        logger.info(f"Settings changed since the last run into {output_dir}; all images are compressed again")
+        return {}
+    outputs = {pair["original"]: pair for pair in data.get("image_pairs", []) if pair.get("original")}
+    for copy in data.get("copied_files", []):
+        if copy.get("original"):
+            outputs.setdefault(copy["original"], copy)
+    return outputs
@@ -2,17 +2,24 @@
 
 This module implements dynamic loading of full-size images and their previews
 using LRU caches whose limits are defined in ``cache_config.toml``. A value of
-``0`` disables the respective limit.
+``0`` disables the respective limit. Combined previews are also kept in the
+user cache directory so they survive between viewer sessions; the least
+recently used files are evicted there as well.
 """
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
 import os
+import tempfile
 from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 
 from PIL import Image
-from PySide6.QtCore import QSize
+from PySide6.QtCore import QSize, QStandardPaths
 from PySide6.QtGui import QColor, QImage, QPainter, QPen, QPixmap
 
 from service.cache_config import CacheConfig, load_cache_config
@@ -39,6 +46,8 @@ def _create_preview_image(path: str, width: int, height: int) -> QImage:
 CONFIG: CacheConfig = load_cache_config()
 _IMAGE_CACHE: OrderedDict[str, QPixmap] = OrderedDict()
 _PREVIEW_CACHE: OrderedDict[str, QImage] = OrderedDict()
+# Overrides the user cache directory when set
+_PREVIEW_DISK_DIR: Path | None = None
 
 
 def _get_cached_pixmap(path: str) -> QPixmap:
@@ -53,12 +62,89 @@ def _get_cached_pixmap(path: str) -> QPixmap:
     return pixmap
 
 
+@lru_cache(maxsize=1)
+def _default_preview_disk_dir() -> Path:
+    # Resolved on first use, after the application has been named
+    location = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    return Path(location or tempfile.gettempdir()) / "photo_compresser_previews"
+
+
+def _preview_disk_dir() -> Path:
+    return _PREVIEW_DISK_DIR or _default_preview_disk_dir()
+
+
+def _preview_disk_path(key: str, path1: str, path2: str) -> Path | None:
+    """Return the on-disk location of a preview, keyed on both source mtimes."""
+
+    try:
+        mtimes = f"{Path(path1).stat().st_mtime_ns}|{Path(path2).stat().st_mtime_ns}"
+    except OSError:
+        return None
+    digest = hashlib.sha1(f"{key}|{mtimes}".encode(), usedforsecurity=False).hexdigest()
+    return _preview_disk_dir() / f"{digest}.png"
+
+
 def _create_combined_preview_image(path1: str, path2: str, size: QSize) -> QImage:
     key = f"{path1}|{path2}|{size.width()}x{size.height()}"
     if key in _PREVIEW_CACHE:
         _PREVIEW_CACHE.move_to_end(key)
         return _PREVIEW_CACHE[key]
 
+    disk_path = _preview_disk_path(key, path1, path2)
+    if disk_path is not None and disk_path.exists():
+        combined = QImage(str(disk_path))
+        if not combined.isNull():
+            # The modification time orders disk previews for eviction
+            with contextlib.suppress(OSError):
+                disk_path.touch()
+            _remember_preview(key, combined)
+            return combined
+
+    combined = _render_combined_preview(path1, path2, size)
+    if disk_path is not None:
+        with contextlib.suppress(OSError):
+            _save_preview(combined, disk_path)
+    _remember_preview(key, combined)
+    return combined
+
+
+def _save_preview(image: QImage, disk_path: Path) -> None:
+    """Write ``image`` to ``disk_path`` atomically and evict old previews."""
+
+    disk_path.parent.mkdir(parents=True, exist_ok=True)
+    # Other threads and viewer instances never see a half-written file
+    fd, tmp_name = tempfile.mkstemp(dir=disk_path.parent, suffix=".tmp")
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        if not image.save(tmp_name, "PNG"):  # type: ignore[call-overload]
+            raise OSError(f"Could not write preview {disk_path}")
+        tmp_path.replace(disk_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    if CONFIG.max_disk_previews > 0:
+        _evict_disk_previews(disk_path.parent, CONFIG.max_disk_previews)
+
+
+def _evict_disk_previews(directory: Path, limit: int) -> None:
+    """Delete the least recently used previews beyond ``limit``."""
+
+    with os.scandir(directory) as it:
+        entries = [entry for entry in it if entry.name.endswith(".png")]
+    if len(entries) <= limit:
+        return
+    by_age: list[tuple[int, str]] = []
+    for entry in entries:
+        try:
+            by_age.append((entry.stat().st_mtime_ns, entry.path))
+        except OSError:
+            continue  # Evicted concurrently
+    by_age.sort()
+    for _, path in by_age[: len(by_age) - limit]:
+        Path(path).unlink(missing_ok=True)
+
+
+def _render_combined_preview(path1: str, path2: str, size: QSize) -> QImage:
     thumb_width = size.width() // 2
     thumb_height = size.height()
 
@@ -81,11 +167,13 @@ def _create_combined_preview_image(path1: str, path2: str, size: QSize) -> QImag
     painter.setPen(pen)
     painter.drawLine(thumb_width, 0, thumb_width, thumb_height)
     painter.end()
+    return combined
+
 
+def _remember_preview(key: str, image: QImage) -> None:
     if CONFIG.max_loaded_previews > 0 and len(_PREVIEW_CACHE) >= CONFIG.max_loaded_previews:
         _PREVIEW_CACHE.popitem(last=False)
-    _PREVIEW_CACHE[key] = combined
-    return combined
+    _PREVIEW_CACHE[key] = image
 
 
 @dataclass(slots=True)
@@ -4,15 +4,16 @@ Image Compression Application
 Main application for compressing images with configurable parameters.
 """
 
-import json
+import multiprocessing
 import sys
+from contextlib import ExitStack
 from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
 from threading import Event
 
-from PySide6.QtCore import QStandardPaths, Qt, QThread, Signal
-from PySide6.QtGui import QAction, QFont, QIcon
+from PySide6.QtCore import QObject, QRunnable, QStandardPaths, Qt, QThreadPool, QTimer, Signal
+from PySide6.QtGui import QAction, QCloseEvent, QFont, QIcon, QTextCursor
 from PySide6.QtWidgets import (
     QApplication,
     QCheckBox,
@@ -47,15 +48,134 @@ from service.file_utils import format_timedelta
 # Import our modules
 from service.image_compression import (
     ImageCompressor,
+    log_pillow_build,
+    previous_outputs,
+    read_settings_file,
     save_compression_settings,
 )
 from service.parameters_defaults import GLOBAL_DEFAULTS
 from service.profile_panel import ProfilePanel
 from service.translator import LANGUAGES, get_language, set_language, tr
 
+# Stylesheet for the compression window, applied once to the QApplication so
+# Qt parses it a single time. Rules are scoped by object name so they do not
+# leak into the comparison viewer.
+_APP_CSS = """
+QMainWindow#compressionWindow {
+    background-color: #f0f0f0;
+}
+#compressionWindow QGroupBox {
+    font-weight: bold;
+    border: 2px solid #cccccc;
+    border-radius: 5px;
+    margin-top: 1ex;
+    padding-top: 10px;
+}
+#compressionWindow QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px 0 5px;
+}
+#compressionWindow QLabel[class="tooltip"] {
+    color: #666;
+    font-style: italic;
+    font-size: 11px;
+}
+QLabel#title {
+    color: #333;
+    margin-bottom: 10px;
+}
+QLabel#status {
+    color: #666;
+    font-style: italic;
+}
+QScrollArea#settingsScroll {
+    border: none;
+}
+QLineEdit#dirEdit {
+    padding: 8px;
+    background-color: white;
+    border: 1px solid #ccc;
+    border-radius: 4px;
+}
+QPushButton#selectDir {
+    background-color: #0078d4;
+    color: white;
+    border: none;
+    padding: 8px 16px;
+    border-radius: 4px;
+    font-weight: bold;
+}
+QPushButton#selectDir:hover {
+    background-color: #106ebe;
+}
+QPushButton#selectDir:pressed {
+    background-color: #005a9e;
+}
+QPushButton#resetSettings {
+    background-color: #e0e0e0;
+    color: #333;
+    border: 1px solid #b3b3b3;
+    padding: 4px 8px;
+    border-radius: 4px;
+    font-size: 11px;
+}
+QPushButton#resetSettings:hover {
+    background-color: #d5d5d5;
+}
+QPushButton#resetSettings:pressed {
+    background-color: #c0c0c0;
+}
+QPushButton#compress, #compare {
+    color: white;
+    border: none;
+    padding: 12px 24px;
+    border-radius: 6px;
+    font-weight: bold;
+    font-size: 14px;
+}
+QPushButton#compress {
+    background-color: #28a745;
+}
+QPushButton#compress:hover {
+    background-color: #218838;
+}
+QPushButton#compress:pressed {
+    background-color: #1e7e34;
+}
+QPushButton#compress[aborting="true"] {
+    background-color: #dc3545;
+}
+QPushButton#compress[aborting="true"]:hover {
+    background-color: #c82333;
+}
+QPushButton#compress[aborting="true"]:pressed {
+    background-color: #bd2130;
+}
+#compare {
+    background-color: #0078d4;
+}
+#compare:hover {
+    background-color: #138496;
+}
+#compare:pressed {
+    background-color: #117a8b;
+}
+QPushButton#compress:disabled, #compare:disabled {
+    background-color: #6c757d;
+}
+QTextEdit#log {
+    background-color: #f8f9fa;
+    border: 1px solid #dee2e6;
+    border-radius: 4px;
+    font-family: 'Courier New', monospace;
+    font-size: 12px;
+}
+"""
+
 
-class CompressionWorker(QThread):
-    """Worker thread for image compression to avoid blocking the UI."""
+class CompressionSignals(QObject):
+    """Signals emitted by :class:`CompressionWorker` from the pool thread."""
 
     progress_updated = Signal(int, int)  # current, total
     status_updated = Signal(str)
@@ -63,6 +183,10 @@ class CompressionWorker(QThread):
     compression_finished = Signal(dict)  # stats
     error_occurred = Signal(str)
 
+
+class CompressionWorker(QRunnable):
+    """Compression job run on the global thread pool to avoid blocking the UI."""
+
     def __init__(
         self,
         compressor: ImageCompressor,
@@ -70,21 +194,37 @@ class CompressionWorker(QThread):
         output_dir: Path,
         compression_settings: dict,
         profiles: list[CompressionProfile],
+        update_existing: bool = False,
     ) -> None:
         super().__init__()
+        # The window queries the worker after it has finished
+        self.setAutoDelete(False)
+        self.signals = CompressionSignals()
         self.compressor = compressor
         self.input_dir = input_dir
         self.output_dir = output_dir
         self.compression_settings = compression_settings
         self.profiles = profiles
+        self.update_existing = update_existing
         self._stop_event = Event()
+        self._finished = Event()
         self.cancelled = False
 
+    def is_running(self) -> bool:
+        """Return ``True`` until :meth:`run` has returned."""
+        return not self._finished.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the job has finished; return ``False`` on timeout."""
+        return self._finished.wait(timeout)
+
     def run(self) -> None:
         """Run the compression process."""
         try:
-            self.status_updated.emit(tr("Starting compression..."))
+            self.signals.status_updated.emit(tr("Starting compression..."))
             start_time = datetime.now()
+            reuse = previous_outputs(self.output_dir, self.compression_settings) if self.update_existing else None
+            copied_files: list[tuple[Path, Path]] = []
 
             # Process the directory
             (
@@ -97,11 +237,12 @@ class CompressionWorker(QThread):
                 self.input_dir,
                 self.output_dir,
                 self.profiles,
-                progress_callback=lambda current, total: self.progress_updated.emit(current, total),
-                status_callback=lambda msg: self.status_updated.emit(msg),
-                log_callback=lambda msg: self.log_updated.emit(msg),
-                num_workers=1,
+                progress_callback=lambda current, total: self.signals.progress_updated.emit(current, total),
+                status_callback=lambda msg: self.signals.status_updated.emit(msg),
+                log_callback=lambda msg: self.signals.log_updated.emit(msg),
                 stop_event=self._stop_event,
+                reuse=reuse,
+                copied_files=copied_files,
             )
 
             # Get compression statistics
@@ -121,10 +262,10 @@ class CompressionWorker(QThread):
 
             # Prepare data for settings file
             image_pairs = profile_results
-            self.status_updated.emit(tr("Saving compression settings..."))
+            self.signals.status_updated.emit(tr("Saving compression settings..."))
 
             # Save compression settings
-            if image_pairs or failed_files:
+            if image_pairs or failed_files or copied_files:
                 save_compression_settings(
                     self.output_dir,
                     self.compression_settings,
@@ -132,23 +273,26 @@ class CompressionWorker(QThread):
                     stats,
                     failed_files,
                     stats["conversion_time"],
+                    copied_files,
                 )
 
             if self._stop_event.is_set():
                 self.cancelled = True
-                self.status_updated.emit(tr("Compression aborted by user"))
+                self.signals.status_updated.emit(tr("Compression aborted by user"))
             else:
-                self.status_updated.emit(
+                self.signals.status_updated.emit(
                     tr("Compression completed! {compressed}/{total} files compressed. {failed} failed.").format(
                         compressed=compressed_files,
                         total=total_files,
                         failed=len(failed_files),
                     )
                 )
-            self.compression_finished.emit(stats)
+            self.signals.compression_finished.emit(stats)
 
         except Exception as e:
-            self.error_occurred.emit(tr("Compression error: {error}").format(error=e))
+            self.signals.error_occurred.emit(tr("Compression error: {error}").format(error=e))
+        finally:
+            self._finished.set()
 
     def stop(self) -> None:
         """Request the worker to stop."""
@@ -164,6 +308,18 @@ class MainWindow(QMainWindow):
         self.output_directory: Path | None = None
         self.input_directory: Path | None = None
         self.progress_start_time: datetime | None = None
+        # Reused across runs so the worker pool survives between them; the
+        # exit stack closes it when the window is closed
+        self._compressor: ImageCompressor | None = None
+        self._compressor_stack = ExitStack()
+
+        # Log lines are buffered and appended in batches; during compression
+        # the worker emits one line per file
+        self._pending_log: list[str] = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(50)
+        self._log_flush_timer.timeout.connect(self._flush_log)
 
         self.setup_ui()
         self.setup_connections()
@@ -172,28 +328,7 @@ class MainWindow(QMainWindow):
         # Set window properties
         self.setWindowTitle(tr("Image Compression Tool"))
         self.setGeometry(100, 100, 1000, 800)
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f0f0f0;
-            }
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #cccccc;
-                border-radius: 5px;
-                margin-top: 1ex;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-            QLabel[class="tooltip"] {
-                color: #666;
-                font-style: italic;
-                font-size: 11px;
-            }
-        """)
+        self.setObjectName("compressionWindow")
 
     def setup_ui(self) -> None:
         """Set up the user interface."""
@@ -226,7 +361,7 @@ class MainWindow(QMainWindow):
         self.title_label = QLabel(tr("Image Compression Tool"))
         self.title_label.setFont(QFont("Arial", 18, QFont.Weight.Bold))
         self.title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.title_label.setStyleSheet("color: #333; margin-bottom: 10px;")
+        self.title_label.setObjectName("title")
         main_layout.addWidget(self.title_label)
 
         # Input section
@@ -237,26 +372,9 @@ class MainWindow(QMainWindow):
         input_dir_layout = QHBoxLayout()
         self.input_dir_edit = QLineEdit()
         self.input_dir_edit.setPlaceholderText(tr("No input directory selected"))
-        self.input_dir_edit.setStyleSheet(
-            "padding: 8px; background-color: white; border: 1px solid #ccc; border-radius: 4px;"
-        )
+        self.input_dir_edit.setObjectName("dirEdit")
         self.select_input_btn = QPushButton(tr("Select Input Directory"))
-        self.select_input_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #0078d4;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #106ebe;
-            }
-            QPushButton:pressed {
-                background-color: #005a9e;
-            }
-        """)
+        self.select_input_btn.setObjectName("selectDir")
 
         input_dir_layout.addWidget(self.input_dir_edit, 1)
         input_dir_layout.addWidget(self.select_input_btn)
@@ -266,30 +384,13 @@ class MainWindow(QMainWindow):
         output_dir_layout = QHBoxLayout()
         self.output_dir_edit = QLineEdit()
         self.output_dir_edit.setPlaceholderText(tr("No output directory selected"))
-        self.output_dir_edit.setStyleSheet(
-            "padding: 8px; background-color: white; border: 1px solid #ccc; border-radius: 4px;"
-        )
+        self.output_dir_edit.setObjectName("dirEdit")
         self.regen_output_btn = QToolButton()
         self.regen_output_btn.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_BrowserReload))
         self.regen_output_btn.setToolTip(tr("Regenerate output directory name"))
         self.regen_output_btn.clicked.connect(self.regenerate_output_directory)
         self.select_output_btn = QPushButton(tr("Select Output Directory"))
-        self.select_output_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #0078d4;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #106ebe;
-            }
-            QPushButton:pressed {
-                background-color: #005a9e;
-            }
-        """)
+        self.select_output_btn.setObjectName("selectDir")
 
         output_dir_layout.addWidget(self.output_dir_edit, 1)
         output_dir_layout.addWidget(self.regen_output_btn)
@@ -299,12 +400,10 @@ class MainWindow(QMainWindow):
         unsupported_dir_layout = QHBoxLayout()
         self.unsupported_dir_edit = QLineEdit()
         self.unsupported_dir_edit.setPlaceholderText(tr("No unsupported directory selected"))
-        self.unsupported_dir_edit.setStyleSheet(
-            "padding: 8px; background-color: white; border: 1px solid #ccc; border-radius: 4px;"
-        )
+        self.unsupported_dir_edit.setObjectName("dirEdit")
         self.unsupported_dir_edit.setVisible(False)
         self.select_unsupported_btn = QPushButton(tr("Select Unsupported Folder"))
-        self.select_unsupported_btn.setStyleSheet(self.select_output_btn.styleSheet())
+        self.select_unsupported_btn.setObjectName("selectDir")
         self.select_unsupported_btn.clicked.connect(self.select_unsupported_directory)
         self.select_unsupported_btn.setVisible(False)
         unsupported_dir_layout.addWidget(self.unsupported_dir_edit, 1)
@@ -325,6 +424,14 @@ class MainWindow(QMainWindow):
         self.copy_unsupported_separate_cb.stateChanged.connect(self.update_copy_unsupported_state)
         input_layout.addWidget(self.copy_unsupported_separate_cb)
 
+        self.strip_metadata_cb = QCheckBox(tr("Strip EXIF/ICC metadata"))
+        self.strip_metadata_cb.setChecked(GLOBAL_DEFAULTS["strip_metadata"])
+        input_layout.addWidget(self.strip_metadata_cb)
+
+        self.update_existing_cb = QCheckBox(tr("Update existing output (skip unchanged files)"))
+        self.update_existing_cb.setChecked(GLOBAL_DEFAULTS["update_existing"])
+        input_layout.addWidget(self.update_existing_cb)
+
         self.update_copy_unsupported_state()
 
         main_layout.addWidget(self.input_group)
@@ -333,7 +440,7 @@ class MainWindow(QMainWindow):
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
         scroll_area.setMaximumHeight(400)
-        scroll_area.setStyleSheet("QScrollArea { border: none; }")
+        scroll_area.setObjectName("settingsScroll")
         scroll_area.setContentsMargins(0, 0, 0, 0)
 
         # Compression settings container
@@ -359,22 +466,7 @@ class MainWindow(QMainWindow):
         header_layout.addWidget(self.add_profile_btn)
 
         self.reset_btn = QPushButton(tr("Reset Settings"))
-        self.reset_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #e0e0e0;
-                color: #333;
-                border: 1px solid #b3b3b3;
-                padding: 4px 8px;
-                border-radius: 4px;
-                font-size: 11px;
-            }
-            QPushButton:hover {
-                background-color: #d5d5d5;
-            }
-            QPushButton:pressed {
-                background-color: #c0c0c0;
-            }
-        """)
+        self.reset_btn.setObjectName("resetSettings")
         header_layout.addWidget(self.reset_btn)
         self.settings_layout.addLayout(header_layout)
 
@@ -396,81 +488,22 @@ class MainWindow(QMainWindow):
         progress_layout.addWidget(self.progress_bar)
 
         self.status_label = QLabel(tr("Ready to compress images"))
-        self.status_label.setStyleSheet("color: #666; font-style: italic;")
+        self.status_label.setObjectName("status")
         progress_layout.addWidget(self.status_label)
 
         # Action buttons
         button_layout = QHBoxLayout()
 
         self.compress_btn = QPushButton(tr("Start Compression"))
-        self.compress_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #28a745;
-                color: white;
-                border: none;
-                padding: 12px 24px;
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #218838;
-            }
-            QPushButton:pressed {
-                background-color: #1e7e34;
-            }
-            QPushButton:disabled {
-                background-color: #6c757d;
-            }
-        """)
-        self.compress_btn_default_style = self.compress_btn.styleSheet()
-        self.abort_btn_style = """
-            QPushButton {
-                background-color: #dc3545;
-                color: white;
-                border: none;
-                padding: 12px 24px;
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #c82333;
-            }
-            QPushButton:pressed {
-                background-color: #bd2130;
-            }
-            QPushButton:disabled {
-                background-color: #6c757d;
-            }
-        """
+        self.compress_btn.setObjectName("compress")
         self.compress_btn.setEnabled(False)
 
         self.compare_btn = QPushButton(tr("Compare Images"))
-        self.compare_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #0078d4;
-                color: white;
-                border: none;
-                padding: 12px 24px;
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #138496;
-            }
-            QPushButton:pressed {
-                background-color: #117a8b;
-            }
-            QPushButton:disabled {
-                background-color: #6c757d;
-            }
-        """)
+        self.compare_btn.setObjectName("compare")
 
         self.compare_menu_btn = QToolButton()
         self.compare_menu_btn.setText("▼")
-        self.compare_menu_btn.setStyleSheet(self.compare_btn.styleSheet())
+        self.compare_menu_btn.setObjectName("compare")
         self.compare_menu_btn.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
 
         self.compare_menu = QMenu(self)
@@ -497,15 +530,7 @@ class MainWindow(QMainWindow):
 
         self.log_text = QTextEdit()
         self.log_text.setMaximumHeight(150)
-        self.log_text.setStyleSheet("""
-            QTextEdit {
-                background-color: #f8f9fa;
-                border: 1px solid #dee2e6;
-                border-radius: 4px;
-                font-family: 'Courier New', monospace;
-                font-size: 12px;
-            }
-        """)
+        self.log_text.setObjectName("log")
         log_layout.addWidget(self.log_text)
 
         # Group progress, buttons, and log together at the bottom
@@ -548,6 +573,22 @@ class MainWindow(QMainWindow):
         self.select_output_btn.setFixedWidth(button_width)
         self.select_unsupported_btn.setFixedWidth(button_width)
 
+    def closeEvent(self, event: QCloseEvent) -> None:
+        """Stop a running compression and shut down the worker pool."""
+        if self.compression_worker and self.compression_worker.is_running():
+            self.compression_worker.stop()
+            self.compression_worker.wait()
+        self._compressor_stack.close()
+        self._compressor = None
+        super().closeEvent(event)
+
+    def _set_abort_style(self, aborting: bool) -> None:
+        """Switch the compress button between its start and abort colours."""
+        self.compress_btn.setProperty("aborting", aborting)
+        # Dynamic properties are only re-evaluated by the style on repolish
+        self.compress_btn.style().unpolish(self.compress_btn)
+        self.compress_btn.style().polish(self.compress_btn)
+
     def update_translations(self) -> None:
         """Update UI text for the selected language."""
         self.setWindowTitle(tr("Image Compression Tool"))
@@ -565,6 +606,8 @@ class MainWindow(QMainWindow):
         self.preserve_structure_cb.setText(tr("Preserve folder structure"))
         self.copy_unsupported_cb.setText(tr("Copy unsupported files"))
         self.copy_unsupported_separate_cb.setText(tr("Copy unsupported files to separate folder"))
+        self.strip_metadata_cb.setText(tr("Strip EXIF/ICC metadata"))
+        self.update_existing_cb.setText(tr("Update existing output (skip unchanged files)"))
         self.select_unsupported_btn.setText(tr("Select Unsupported Folder"))
         self.save_profiles_btn.setText(tr("Save Profiles"))
         self.load_profiles_btn.setText(tr("Load Profiles"))
@@ -572,12 +615,12 @@ class MainWindow(QMainWindow):
         self.reset_btn.setText(tr("Reset Settings"))
         self.progress_group.setTitle(tr("Progress"))
         self.status_label.setText(tr("Ready to compress images"))
-        if self.compression_worker and self.compression_worker.isRunning():
+        if self.compression_worker and self.compression_worker.is_running():
             self.compress_btn.setText(tr("Abort Compression"))
-            self.compress_btn.setStyleSheet(self.abort_btn_style)
+            self._set_abort_style(True)
         else:
             self.compress_btn.setText(tr("Start Compression"))
-            self.compress_btn.setStyleSheet(self.compress_btn_default_style)
+            self._set_abort_style(False)
         self.compare_btn.setText(tr("Compare Images"))
         self.compare_menu_btn.setFixedHeight(self.compare_btn.sizeHint().height())
         self.compare_stats_only_action.setText(tr("Compare Stats Only"))
@@ -610,6 +653,8 @@ class MainWindow(QMainWindow):
         self.preserve_structure_cb.setChecked(GLOBAL_DEFAULTS["preserve_structure"])
         self.copy_unsupported_cb.setChecked(GLOBAL_DEFAULTS["copy_unsupported"])
         self.copy_unsupported_separate_cb.setChecked(GLOBAL_DEFAULTS["copy_unsupported_to_dir"])
+        self.strip_metadata_cb.setChecked(GLOBAL_DEFAULTS["strip_metadata"])
+        self.update_existing_cb.setChecked(GLOBAL_DEFAULTS["update_existing"])
         self.unsupported_dir_edit.clear()
         self.update_copy_unsupported_state()
         self.log_message(tr("Compression settings reset to defaults"))
@@ -749,7 +794,7 @@ class MainWindow(QMainWindow):
 
     def start_compression(self) -> None:
         """Start the compression process."""
-        if self.compression_worker and self.compression_worker.isRunning():
+        if self.compression_worker and self.compression_worker.is_running():
             self.log_message(tr("Stopping compression..."))
             self.status_label.setText(tr("Stopping compression..."))
             self.compression_worker.stop()
@@ -770,7 +815,8 @@ class MainWindow(QMainWindow):
             self.output_directory = self.generate_output_directory()
             self.output_dir_edit.setText(str(self.output_directory))
 
-        if self.output_directory.exists():
+        update_existing = self.update_existing_cb.isChecked()
+        if self.output_directory.exists() and not update_existing:
             QMessageBox.warning(
                 self,
                 tr("Warning"),
@@ -784,20 +830,21 @@ class MainWindow(QMainWindow):
         preserve_structure = self.preserve_structure_cb.isChecked()
         copy_unsupported = self.copy_unsupported_cb.isChecked()
         copy_unsupported_to_dir = self.copy_unsupported_separate_cb.isChecked()
+        strip_metadata = self.strip_metadata_cb.isChecked()
         unsupported_dir = (
             Path(self.unsupported_dir_edit.text())
             if copy_unsupported and copy_unsupported_to_dir and self.unsupported_dir_edit.text()
             else None
         )
-        compressor = ImageCompressor(
-            quality=default_profile.quality,
-            max_largest_side=default_profile.max_largest_side,
-            max_smallest_side=default_profile.max_smallest_side,
-            preserve_structure=preserve_structure,
-            copy_unsupported=copy_unsupported,
-            unsupported_dir=unsupported_dir,
-            output_format=default_profile.output_format,
-        )
+        if self._compressor is None:
+            # Keep the worker pool (and the encoder state in its processes)
+            # alive until the window is closed
+            self._compressor = self._compressor_stack.enter_context(ImageCompressor())
+        compressor = self._compressor
+        compressor.preserve_structure = preserve_structure
+        compressor.copy_unsupported = copy_unsupported
+        compressor.unsupported_dir = unsupported_dir
+        compressor.strip_metadata = strip_metadata
         compressor.apply_profile(default_profile)
 
         compression_settings = {
@@ -808,6 +855,7 @@ class MainWindow(QMainWindow):
             "copy_unsupported": copy_unsupported,
             "copy_unsupported_to_dir": copy_unsupported_to_dir,
             "unsupported_dir": str(unsupported_dir) if unsupported_dir else "",
+            "strip_metadata": strip_metadata,
         }
 
         # Create and start worker thread
@@ -818,30 +866,36 @@ class MainWindow(QMainWindow):
             self.output_directory,
             compression_settings,
             profiles,
+            update_existing,
         )
-        self.compression_worker.progress_updated.connect(self.update_progress)
-        self.compression_worker.status_updated.connect(self.update_status)
-        self.compression_worker.log_updated.connect(self.log_message)
-        self.compression_worker.compression_finished.connect(self.compression_finished)
-        self.compression_worker.error_occurred.connect(self.compression_error)
+        self.compression_worker.signals.progress_updated.connect(self.update_progress)
+        self.compression_worker.signals.status_updated.connect(self.update_status)
+        self.compression_worker.signals.log_updated.connect(self.log_message)
+        self.compression_worker.signals.compression_finished.connect(self.compression_finished)
+        self.compression_worker.signals.error_occurred.connect(self.compression_error)
 
         self.progress_start_time = datetime.now()
 
         # Update UI
         self.compress_btn.setText(tr("Abort Compression"))
-        self.compress_btn.setStyleSheet(self.abort_btn_style)
+        self._set_abort_style(True)
         self.compare_btn.setEnabled(False)
         self.compare_menu_btn.setEnabled(False)
         self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)  # Indeterminate progress
+        # Determinate from the start; the worker reports the real total
+        self.progress_bar.setRange(0, 1)
+        self.progress_bar.setValue(0)
 
         # Start compression
-        self.compression_worker.start()
+        QThreadPool.globalInstance().start(self.compression_worker)
         self.log_message(tr("Starting compression process..."))
 
     def update_progress(self, current: int, total: int) -> None:
         """Update progress bar."""
-        self.progress_bar.setRange(0, total)
+        # A zero maximum would switch the bar back to the busy animation
+        maximum = max(total, 1)
+        if self.progress_bar.maximum() != maximum:
+            self.progress_bar.setRange(0, maximum)
         self.progress_bar.setValue(current)
         if current > 0 and self.progress_start_time:
             elapsed = datetime.now() - self.progress_start_time
@@ -866,7 +920,7 @@ class MainWindow(QMainWindow):
 
         # Update UI
         self.compress_btn.setText(tr("Start Compression"))
-        self.compress_btn.setStyleSheet(self.compress_btn_default_style)
+        self._set_abort_style(False)
         self.compress_btn.setEnabled(True)
         self.compare_btn.setEnabled(True)
         self.compare_menu_btn.setEnabled(True)
@@ -898,7 +952,7 @@ Output directory: {self.output_directory}
     def compression_error(self, error_message: str) -> None:
         """Handle compression error."""
         self.compress_btn.setText(tr("Start Compression"))
-        self.compress_btn.setStyleSheet(self.compress_btn_default_style)
+        self._set_abort_style(False)
         self.compress_btn.setEnabled(True)
         self.compare_btn.setEnabled(True)
         self.compare_menu_btn.setEnabled(True)
@@ -925,8 +979,8 @@ Output directory: {self.output_directory}
         if not file2:
             return
         try:
-            data1 = json.loads(Path(file1).read_text())
-            data2 = json.loads(Path(file2).read_text())
+            data1 = read_settings_file(Path(file1))
+            data2 = read_settings_file(Path(file2))
         except Exception as e:
             QMessageBox.critical(
                 self,
@@ -971,16 +1025,38 @@ Output directory: {self.output_directory}
     def log_message(self, message: str) -> None:
         """Add a message to the log."""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.append(f"[{timestamp}] {message}")
+        self._pending_log.append(f"[{timestamp}] {message}")
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    def _flush_log(self) -> None:
+        """Append buffered log lines in a single layout pass."""
+        if not self._pending_log:
+            return
+        lines, self._pending_log = self._pending_log, []
+        scrollbar = self.log_text.verticalScrollBar()
+        follow = scrollbar.value() == scrollbar.maximum()
+        # A single plain-text insert lays the document out once; each line
+        # still becomes its own paragraph
+        cursor = QTextCursor(self.log_text.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        prefix = "\n" if not self.log_text.document().isEmpty() else ""
+        cursor.insertText(prefix + "\n".join(lines))
+        if follow:
+            scrollbar.setValue(scrollbar.maximum())
 
 
 def main() -> None:
     """Main application entry point."""
+    # Required for ProcessPoolExecutor workers in frozen (PyInstaller/Nuitka) builds
+    multiprocessing.freeze_support()
+    log_pillow_build()
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon(":/bp.ico"))  # общий значок для всех окон
 
     # Set application style
     app.setStyle("Fusion")
+    app.setStyleSheet(_APP_CSS)
 
     # Create and show main window
     window = MainWindow()
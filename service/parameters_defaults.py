@@ -53,12 +53,16 @@ class GlobalDefaults(TypedDict):
     preserve_structure: bool
     copy_unsupported: bool
     copy_unsupported_to_dir: bool
+    update_existing: bool
+    strip_metadata: bool
 
 
 GLOBAL_DEFAULTS: GlobalDefaults = {
     "preserve_structure": True,
     "copy_unsupported": True,
     "copy_unsupported_to_dir": False,
+    "update_existing": False,
+    "strip_metadata": False,
 }
 
 JPEG_DEFAULTS: JpegDefaults = {
@@ -78,7 +82,7 @@ WEBP_DEFAULTS: WebpDefaults = {
 
 AVIF_DEFAULTS: AvifDefaults = {
     "subsampling": "4:2:0",
-    "speed": 6,
+    "speed": 8,
     "codec": "auto",
     "range": "full",
     "qmin": -1,
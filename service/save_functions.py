@@ -1,25 +1,63 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from functools import cache
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 import pillow_avif  # noqa: F401
 from PIL import Image
 
+from service.compression_profiles import image_has_transparency
+
+# SVT-AV1 (выбирается для codec="auto", см. save_avif) печатает в stderr баннер
+# из ~23 строк на каждый кадр. Уровень 1 оставляет только ошибки; переменная
+# читается при создании кодировщика и наследуется процессами-воркерами
+os.environ.setdefault("SVT_LOG", "1")
+
+# Необязательный быстрый путь JPEG через libjpeg-turbo (см. requirements-fast.txt)
+try:
+    import numpy as np
+    from turbojpeg import (
+        TJFLAG_PROGRESSIVE,
+        TJPF_GRAY,
+        TJPF_RGB,
+        TJSAMP_420,
+        TJSAMP_422,
+        TJSAMP_444,
+        TJSAMP_GRAY,
+        TurboJPEG,
+    )
+
+    # Свой экземпляр в каждом процессе: модуль импортируется воркером заново
+    _TURBO: Any = TurboJPEG()
+except (ImportError, OSError, RuntimeError):  # нет пакета или libturbojpeg
+    _TURBO = None
+
 
 # ВСПОМОГАТЕЛЬНОЕ: аккуратно убирать альфу для JPEG
 def _flatten_for_jpeg(im: Image.Image, background: tuple[int, int, int] = (255, 255, 255)) -> Image.Image:
     """
     JPEG не поддерживает альфа-канал. Эта функция безопасно «сплющит» RGBA к RGB.
     """
-    if im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info):
+    if im.mode == "RGBA":
+        # Один проход: вставка по маске альфы на непрозрачный фон
+        bg = Image.new("RGB", im.size, background)
+        bg.paste(im, mask=im.getchannel("A"))
+        return bg
+    if im.mode == "LA" or (im.mode == "P" and "transparency" in im.info):
         bg = Image.new("RGB", im.size, background)
         return Image.alpha_composite(bg.convert("RGBA"), im.convert("RGBA")).convert("RGB")
-    return im.convert("RGB") if im.mode not in ("RGB", "L") else im
+    # L, RGB и CMYK libjpeg кодирует напрямую, без лишней копии изображения
+    return im.convert("RGB") if im.mode not in ("RGB", "L", "CMYK") else im
 
 
 # JPEG
 def save_jpeg(
     im: Image.Image,
-    dst: Path,
+    dst: str | Path | BinaryIO,
     *,
     quality: int = 75,  # [БАЗОВЫЙ] 0–100 (дефолт Pillow: 75). Ниже → сильнее сжатие
     subsampling: int | str = -1,
@@ -55,6 +93,19 @@ def save_jpeg(
         "keep_rgb": keep_rgb,  # False по умолчанию
     }
 
+    # libjpeg-turbo: только если не нужны возможности, которые есть лишь у Pillow
+    if _TURBO is not None and not optimize and not smooth and not keep_rgb and qtables is None:
+        try:
+            data = _encode_turbo(im, quality=quality, subsampling=subsampling, progressive=progressive)
+            data = _insert_jpeg_segments(data, exif=exif, icc_profile=icc_profile, xmp=xmp)
+            if isinstance(dst, str | Path):
+                Path(dst).write_bytes(data)
+            else:
+                dst.write(data)
+            return
+        except Exception:  # noqa: S110 - любая ошибка → обычный путь через Pillow
+            pass
+
     # Сохраняем метаданные источника без изменений
     if exif:
         kwargs["exif"] = exif
@@ -66,10 +117,64 @@ def save_jpeg(
     im.save(dst, format="JPEG", **{k: v for k, v in kwargs.items() if v is not None})
 
 
+def _encode_turbo(im: Image.Image, *, quality: int, subsampling: int | str, progressive: bool) -> bytes:
+    """
+    Кодирует RGB/L изображение в JPEG через libjpeg-turbo (SIMD DCT и Хаффман).
+    """
+    if im.mode == "L":
+        pixel_format, sampling = TJPF_GRAY, TJSAMP_GRAY
+    elif im.mode == "RGB":
+        pixel_format = TJPF_RGB
+        # -1 (авто) у Pillow означает 4:2:0
+        sampling = {0: TJSAMP_444, "4:4:4": TJSAMP_444, 1: TJSAMP_422, "4:2:2": TJSAMP_422}.get(subsampling, TJSAMP_420)
+    else:
+        raise ValueError(f"Unsupported mode for TurboJPEG: {im.mode}")
+    flags = TJFLAG_PROGRESSIVE if progressive else 0
+    return bytes(
+        _TURBO.encode(np.asarray(im), quality=quality, pixel_format=pixel_format, jpeg_subsample=sampling, flags=flags)
+    )
+
+
+def _insert_jpeg_segments(
+    data: bytes,
+    *,
+    exif: bytes | None = None,
+    icc_profile: bytes | None = None,
+    xmp: bytes | str | None = None,
+) -> bytes:
+    """
+    Вставляет APP-сегменты EXIF (APP1), XMP (APP1) и ICC (APP2, частями) сразу после SOI,
+    как это делает Pillow при сохранении JPEG.
+    """
+    segments = []
+    if exif:
+        if not exif.startswith(b"Exif\x00\x00"):
+            exif = b"Exif\x00\x00" + exif
+        segments.append(_jpeg_segment(0xE1, exif))
+    if xmp:
+        xmp_bytes = xmp.encode() if isinstance(xmp, str) else xmp
+        segments.append(_jpeg_segment(0xE1, b"http://ns.adobe.com/xap/1.0/\x00" + xmp_bytes))
+    if icc_profile:
+        # Максимум 65519 байт профиля на сегмент (65533 - 14 байт заголовка)
+        chunks = [icc_profile[i : i + 65519] for i in range(0, len(icc_profile), 65519)]
+        for index, chunk in enumerate(chunks, start=1):
+            header = b"ICC_PROFILE\x00" + bytes((index, len(chunks)))
+            segments.append(_jpeg_segment(0xE2, header + chunk))
+    if not segments:
+        return data
+    return data[:2] + b"".join(segments) + data[2:]
+
+
+def _jpeg_segment(marker: int, payload: bytes) -> bytes:
+    if len(payload) > 65533:
+        raise ValueError("JPEG segment too large")
+    return bytes((0xFF, marker)) + (len(payload) + 2).to_bytes(2, "big") + payload
+
+
 # WebP
 def save_webp(
     im: Image.Image,
-    dst: str | Path,
+    dst: str | Path | BinaryIO,
     *,
     lossless: bool = False,  # [БАЗОВЫЙ] False/True. Влияет радикально на метод сжатия
     quality: int = 80,  # [БАЗОВЫЙ] 0–100. Для lossless — «усилие» (0–100), дефолт 80
@@ -107,16 +212,26 @@ def save_webp(
     if xmp:
         kwargs["xmp"] = xmp
 
-    dst_path = Path(dst)
-
-    im.save(dst_path, format="WEBP", **kwargs)
+    # dst может быть и файловым объектом (буфер для фоновой записи)
+    im.save(Path(dst) if isinstance(dst, str) else dst, format="WEBP", **kwargs)
 
 
 # ────────────────────────────────────────────────────────────────────────────────
 # AVIF (через pillow-avif-plugin; в официальном Pillow — аналогично по ключам)
+@cache
+def _avif_codec_available(codec: str) -> bool:
+    """Проверяет, собран ли зарегистрированный AVIF-плагин с кодеком ``codec``."""
+    Image.init()
+    handler = Image.SAVE.get("AVIF")
+    module = sys.modules.get(handler.__module__) if handler else None
+    # И pillow-avif-plugin, и встроенный плагин Pillow держат модуль _avif
+    check = getattr(getattr(module, "_avif", None), "encoder_codec_available", None)
+    return bool(check and check(codec))
+
+
 def save_avif(
     im: Image.Image,
-    dst: str | Path,
+    dst: str | Path | BinaryIO,
     *,
     quality: int = 75,  # [БАЗОВЫЙ] 0–100 (дефолт 75). Ниже → сильнее сжатие
     subsampling: str = "4:2:0",  # [БАЗОВЫЙ] "4:2:0" (дефолт) | "4:2:2" | "4:4:4" | "4:0:0"
@@ -141,11 +256,22 @@ def save_avif(
     icc_profile = im.info.get("icc_profile")
     xmp = im.info.get("xmp")
 
+    # "auto" в libavif означает aom. SVT-AV1 на фото в разы быстрее за счёт
+    # SIMD, но кодирует только 4:2:0 без альфы и не берёт совсем мелкие кадры
+    if (
+        codec == "auto"
+        and subsampling == "4:2:0"
+        and im.mode == "RGB"
+        and min(im.size) >= 64
+        and _avif_codec_available("svt")
+    ):
+        codec = "svt"
+
     kwargs: dict[str, Any] = {
         "quality": quality,  # 0–100 (75)
         "subsampling": subsampling,  # "4:2:0" (деф.), "4:2:2", "4:4:4", "4:0:0"
         "speed": speed,  # 0–10 (6)
-        "codec": codec,  # "auto"
+        "codec": codec,  # "auto" (или "svt", см. выше)
         "range": range_,  # "full"
         "qmin": qmin,  # -1
         "qmax": qmax,  # -1
@@ -166,6 +292,100 @@ def save_avif(
     if xmp:
         kwargs["xmp"] = xmp
 
+    # dst может быть и файловым объектом (буфер для фоновой записи)
+    im.save(Path(dst) if isinstance(dst, str) else dst, format="AVIF", **kwargs)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Внешние кодеки: avifenc (libavif) и cwebp (libwebp) умеют кодировать одно
+# изображение в несколько потоков, чего нет при сохранении через Pillow.
+AVIFENC = shutil.which("avifenc")
+CWEBP = shutil.which("cwebp")
+
+
+def _run_with_png(im: Image.Image, dst: Path, build_cmd: Any) -> None:
+    """
+    Пишет промежуточный PNG (без сжатия, с EXIF/ICC источника) рядом с dst
+    и запускает внешний кодек командой build_cmd(png_path).
+    """
+    exif = im.info.get("exif")
+    if isinstance(exif, Image.Exif):
+        exif = exif.tobytes()
+    kwargs: dict[str, Any] = {"compress_level": 0}
+    if exif:
+        kwargs["exif"] = exif
+    if im.info.get("icc_profile"):
+        kwargs["icc_profile"] = im.info["icc_profile"]
+    if im.mode not in ("RGB", "RGBA"):
+        im = im.convert("RGBA" if image_has_transparency(im) else "RGB")
+
+    fd, tmp_name = tempfile.mkstemp(suffix=".png", dir=dst.parent)
+    os.close(fd)
+    tmp = Path(tmp_name)
+    try:
+        im.save(tmp, format="PNG", **kwargs)
+        subprocess.run(build_cmd(tmp), check=True, capture_output=True)  # noqa: S603 - путь к кодеку из shutil.which
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def save_avif_avifenc(
+    im: Image.Image,
+    dst: str | Path,
+    *,
+    quality: int = 75,  # [БАЗОВЫЙ] 0–100
+    subsampling: str = "4:2:0",  # "4:2:0" | "4:2:2" | "4:4:4" | "4:0:0"
+    speed: int = 6,  # 0–10
+    codec: str = "auto",  # "auto" | "aom" | "rav1e" | "svt"
+    range_: str = "full",  # "full" | "limited"
+    jobs: str = "all",  # потоки кодека: "all" или число; при пуле процессов — "1"
+) -> None:
+    """
+    Сохраняет как AVIF через avifenc. Метаданные avifenc берёт из промежуточного PNG.
+    """
+    if AVIFENC is None:
+        raise FileNotFoundError("avifenc not found")
+    avifenc = AVIFENC
     dst_path = Path(dst)
 
-    im.save(dst_path, format="AVIF", **kwargs)
+    def build_cmd(src: Path) -> list[str]:
+        cmd = [avifenc, "-q", str(quality), "-s", str(speed), "-y", subsampling.replace(":", "")]
+        cmd += ["-r", range_, "-j", jobs]
+        if codec != "auto":
+            cmd += ["-c", codec]
+        return [*cmd, str(src), str(dst_path)]
+
+    _run_with_png(im, dst_path, build_cmd)
+
+
+def save_webp_cwebp(
+    im: Image.Image,
+    dst: str | Path,
+    *,
+    lossless: bool = False,
+    quality: int = 80,  # 0–100
+    method: int = 4,  # 0–6
+    alpha_quality: int = 100,  # 0–100
+    exact: bool = False,
+    multithread: bool = True,  # -mt; при пуле процессов лучше отключить
+) -> None:
+    """
+    Сохраняет как WebP через cwebp с сохранением метаданных (-metadata all).
+    """
+    if CWEBP is None:
+        raise FileNotFoundError("cwebp not found")
+    cwebp = CWEBP
+    dst_path = Path(dst)
+
+    def build_cmd(src: Path) -> list[str]:
+        cmd = [cwebp, "-quiet", "-q", str(quality), "-m", str(method), "-alpha_q", str(alpha_quality)]
+        cmd += ["-metadata", "all"]
+        if lossless:
+            cmd.append("-lossless")
+        if exact:
+            cmd.append("-exact")
+        if multithread:
+            cmd.append("-mt")
+        return [*cmd, str(src), "-o", str(dst_path)]
+
+    _run_with_png(im, dst_path, build_cmd)
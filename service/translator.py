@@ -143,6 +143,11 @@ _translations: dict[str, dict[str, str]] = {
         "Preserve folder structure": "Сохранить структуру папок",
         "Copy unsupported files": "Копировать неподдерживаемые файлы",
         "Copy unsupported files to separate folder": "Копировать неподдерживаемые файлы в отдельную папку",
+        "Update existing output (skip unchanged files)": (
+            "Обновить существующую папку вывода (пропускать неизменённые файлы)"
+        ),
+        "Strip EXIF/ICC metadata": "Удалять метаданные EXIF/ICC",
+        "Unchanged, kept previous output: {name}": "Без изменений, оставлен прежний результат: {name}",
         "Select Unsupported Folder": "Выбрать папку неподдерживаемых",
         "Regenerated unsupported folder: {path}": "Сгенерирована папка неподдерживаемых: {path}",
         "Unsupported files folder": "Папка неподдерживаемых файлов",
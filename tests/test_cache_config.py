@@ -0,0 +1,16 @@
+from pathlib import Path
+
+from service.cache_config import CacheConfig, load_cache_config
+
+
+def test_missing_or_default_config_shares_instance(tmp_path: Path) -> None:
+    zeros = tmp_path / "zeros.toml"
+    zeros.write_text("max_loaded_images = 0\n", encoding="utf-8")
+    limited = tmp_path / "limited.toml"
+    limited.write_text("max_loaded_images = 5\nmax_loaded_previews = 7\n", encoding="utf-8")
+
+    missing = load_cache_config(tmp_path / "missing.toml")
+
+    assert missing == CacheConfig()
+    assert load_cache_config(zeros) is missing
+    assert load_cache_config(limited) == CacheConfig(max_loaded_images=5, max_loaded_previews=7)
@@ -0,0 +1,186 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from PySide6.QtCore import QPoint, QSize, QThreadPool
+from PySide6.QtWidgets import QApplication
+
+from service import image_pair
+from service.cache_config import CacheConfig
+from service.image_comparison_viewer import FORMATS_PATTERNS, ComparisonViewer, ThumbnailWidget
+from service.image_pair import ImagePair
+
+
+@pytest.fixture(scope="module")
+def qapp() -> QApplication:
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+@pytest.fixture(autouse=True)
+def preview_disk_dir(tmp_path: Path, monkeypatch) -> Path:
+    # Keep previews out of the user cache directory
+    disk_dir = tmp_path / "thumbs"
+    monkeypatch.setattr(image_pair, "_PREVIEW_DISK_DIR", disk_dir)
+    return disk_dir
+
+
+@pytest.fixture
+def viewer(qapp: QApplication, tmp_path: Path) -> ComparisonViewer:
+    assert qapp is not None  # ensure fixture is used
+    first = tmp_path / "a.png"
+    second = tmp_path / "b.png"
+    Image.new("RGB", (800, 400), "red").save(first)
+    Image.new("RGB", (400, 200), "blue").save(second)
+    widget = ComparisonViewer()
+    widget.resize(420, 320)
+    widget.set_image_pair(ImagePair(str(first), str(second)))
+    return widget
+
+
+def test_scaled_pixmaps_reused_until_zoom_changes(viewer: ComparisonViewer) -> None:
+    first, second = viewer.get_scaled_pixmaps()
+    again, _ = viewer.get_scaled_pixmaps()
+
+    assert again.cacheKey() == first.cacheKey()
+    assert first.size() == second.size()
+
+    viewer.zoom_factor = 1.5
+    zoomed, _ = viewer.get_scaled_pixmaps()
+
+    assert zoomed.cacheKey() != first.cacheKey()
+    assert zoomed.width() == int(first.width() * 1.5)
+
+
+def test_paint_splits_images_at_slider(viewer: ComparisonViewer) -> None:
+    image = viewer.grab().toImage()
+    center = viewer.get_display_rect().center()
+
+    assert image.pixelColor(center.x() - 20, center.y()).name() == "#ff0000"
+    assert image.pixelColor(center.x() + 20, center.y()).name() == "#0000ff"
+
+
+def test_fast_scaling_while_dragging_redone_on_release(viewer: ComparisonViewer) -> None:
+    viewer.is_panning = True
+    dragged, _ = viewer.get_scaled_pixmaps()
+
+    assert viewer.get_scaled_pixmaps()[0].cacheKey() == dragged.cacheKey()
+
+    viewer.is_panning = False
+    released, _ = viewer.get_scaled_pixmaps()
+
+    assert released.cacheKey() != dragged.cacheKey()
+    assert released.size() == dragged.size()
+    assert viewer.get_scaled_pixmaps()[0].cacheKey() == released.cacheKey()
+
+
+def test_slider_hit_test_uses_painted_geometry(viewer: ComparisonViewer, monkeypatch) -> None:
+    center = viewer.get_display_rect().center()
+    assert not viewer.is_near_slider(center)
+
+    viewer.grab()
+
+    def failing_scale():  # type: ignore[no-untyped-def]
+        raise AssertionError("hover should not rescale")
+
+    monkeypatch.setattr(viewer, "get_scaled_pixmaps", failing_scale)
+
+    assert viewer.is_near_slider(center)
+    assert not viewer.is_near_slider(QPoint(center.x() + 40, center.y()))
+    viewer.pan_offset = QPoint(40, 0)
+    assert viewer.is_near_slider(QPoint(center.x() + 40, center.y()))
+
+
+def test_thumbnail_loaded_in_background(qapp: QApplication, tmp_path: Path) -> None:
+    first = tmp_path / "thumb_a.png"
+    second = tmp_path / "thumb_b.png"
+    Image.new("RGB", (300, 200), "red").save(first)
+    Image.new("RGB", (300, 200), "blue").save(second)
+    widget = ThumbnailWidget(ImagePair(str(first), str(second)))
+    widget.show()
+    qapp.processEvents()
+
+    assert widget._is_loading
+
+    QThreadPool.globalInstance().waitForDone()
+    qapp.processEvents()
+
+    assert widget._thumbnail is not None
+    assert not widget._is_loading
+
+
+def test_previews_reloaded_from_disk(qapp: QApplication, tmp_path: Path, preview_disk_dir: Path, monkeypatch) -> None:
+    assert qapp is not None  # ensure fixture is used
+    first = tmp_path / "disk_a.png"
+    second = tmp_path / "disk_b.png"
+    Image.new("RGB", (300, 200), "red").save(first)
+    Image.new("RGB", (300, 200), "blue").save(second)
+    monkeypatch.setattr(image_pair, "_PREVIEW_CACHE", OrderedDict())
+    pair = ImagePair(str(first), str(second))
+
+    rendered = pair.create_thumbnail()
+    assert len(list(preview_disk_dir.iterdir())) == 1
+
+    def failing_render(*args):  # type: ignore[no-untyped-def]
+        raise AssertionError("preview should come from disk")
+
+    monkeypatch.setattr(image_pair, "_PREVIEW_CACHE", OrderedDict())
+    monkeypatch.setattr(image_pair, "_render_combined_preview", failing_render)
+
+    assert pair.create_thumbnail().toImage() == rendered.toImage()
+
+    os.utime(first, ns=(0, 0))
+    monkeypatch.setattr(image_pair, "_PREVIEW_CACHE", OrderedDict())
+    with pytest.raises(AssertionError):
+        pair.create_thumbnail()
+
+
+def test_disk_previews_evicted_least_recently_used(
+    qapp: QApplication, tmp_path: Path, preview_disk_dir: Path, monkeypatch
+) -> None:
+    assert qapp is not None  # ensure fixture is used
+    monkeypatch.setattr(image_pair, "CONFIG", CacheConfig(max_disk_previews=2))
+    monkeypatch.setattr(image_pair, "_PREVIEW_CACHE", OrderedDict())
+    source = tmp_path / "evict.png"
+    Image.new("RGB", (40, 20), "red").save(source)
+    pair = ImagePair(str(source), str(source))
+
+    paths = {
+        width: image_pair._preview_disk_path(f"{source}|{source}|{width}x10", str(source), str(source))
+        for width in (10, 20, 30)
+    }
+    pair.create_thumbnail(QSize(10, 10))
+    pair.create_thumbnail(QSize(20, 10))
+    # Fixed ages regardless of the filesystem's timestamp resolution
+    os.utime(paths[10], ns=(1, 1))
+    os.utime(paths[20], ns=(2, 2))
+
+    # Reading a preview back from disk marks it as recently used
+    monkeypatch.setattr(image_pair, "_PREVIEW_CACHE", OrderedDict())
+    pair.create_thumbnail(QSize(10, 10))
+    pair.create_thumbnail(QSize(30, 10))
+
+    assert sorted(preview_disk_dir.iterdir()) == sorted([paths[10], paths[30]])
+
+
+def test_labels_rendered_once_per_pair(viewer: ComparisonViewer) -> None:
+    viewer.grab()
+    labels = viewer._label_pixmaps
+    viewer.grab()
+
+    assert labels is not None
+    assert viewer._label_pixmaps is labels
+    assert viewer.left_profile_rect.width() == labels[0].width()
+    assert viewer.left_profile_rect.bottom() < viewer.get_display_rect().bottom()
+
+
+def test_file_dialog_patterns_use_single_dot() -> None:
+    assert "*.jpg" in FORMATS_PATTERNS.split()
+    assert ".." not in FORMATS_PATTERNS
@@ -0,0 +1,209 @@
+import mmap
+from pathlib import Path
+
+from PIL import Image, ImageCms, JpegImagePlugin
+
+from service import image_compression
+from service.image_compression import ImageCompressor
+
+
+def test_large_jpeg_downscaled_with_draft(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "big.jpg"
+    Image.new("RGB", (2000, 1000), "red").save(src)
+    drafts: list[tuple[str, tuple[int, int]]] = []
+    original_draft = JpegImagePlugin.JpegImageFile.draft
+
+    def recording_draft(self, mode, size):  # type: ignore[no-untyped-def]
+        drafts.append((mode, size))
+        return original_draft(self, mode, size)
+
+    monkeypatch.setattr(JpegImagePlugin.JpegImageFile, "draft", recording_draft)
+
+    compressor = ImageCompressor(max_largest_side=200, max_smallest_side=None)
+    saved, error = compressor.compress_image(src, tmp_path / "out.jpg")
+
+    assert error is None
+    assert saved is not None
+    assert drafts == [("RGB", (400, 200))]
+    with Image.open(saved) as out:
+        assert out.size == (200, 100)
+
+
+def _record_reduce(monkeypatch) -> list[int | tuple[int, int]]:  # type: ignore[no-untyped-def]
+    factors: list[int | tuple[int, int]] = []
+    original_reduce = Image.Image.reduce
+
+    def recording_reduce(self, factor, box=None):  # type: ignore[no-untyped-def]
+        factors.append(factor)
+        return original_reduce(self, factor, box)
+
+    monkeypatch.setattr(Image.Image, "reduce", recording_reduce)
+    return factors
+
+
+def test_large_downscale_reduces_before_lanczos(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "big.png"
+    Image.new("RGB", (1800, 1200), "blue").save(src)
+    factors = _record_reduce(monkeypatch)
+
+    compressor = ImageCompressor(max_largest_side=350, max_smallest_side=None)
+    saved, error = compressor.compress_image(src, tmp_path / "out.jpg")
+
+    assert error is None
+    assert saved is not None
+    assert factors == [(2, 2)]
+    with Image.open(saved) as out:
+        assert out.size == (350, 233)
+
+
+def test_integer_downscale_uses_reduce_only(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "big.png"
+    Image.new("RGB", (1800, 1200), "blue").save(src)
+    factors = _record_reduce(monkeypatch)
+
+    compressor = ImageCompressor(max_largest_side=300, max_smallest_side=None)
+    saved, error = compressor.compress_image(src, tmp_path / "out.jpg")
+
+    assert error is None
+    assert saved is not None
+    assert factors == [6]
+    with Image.open(saved) as out:
+        assert out.size == (300, 200)
+
+
+def test_skip_unchanged_copies_source(tmp_path: Path) -> None:
+    small = tmp_path / "small.jpg"
+    Image.new("RGB", (100, 50), "green").save(small, quality=95)
+    large = tmp_path / "large.jpg"
+    Image.new("RGB", (400, 200), "green").save(large, quality=95)
+    png = tmp_path / "small.png"
+    Image.new("RGB", (100, 50), "green").save(png)
+
+    compressor = ImageCompressor(quality=50, max_largest_side=300, max_smallest_side=None, skip_unchanged=True)
+    saved_small, _ = compressor.compress_image(small, tmp_path / "out" / "small.jpg")
+    saved_large, _ = compressor.compress_image(large, tmp_path / "out" / "large.jpg")
+    saved_png, _ = compressor.compress_image(png, tmp_path / "out" / "png.jpg")
+
+    assert saved_small is not None
+    assert saved_large is not None
+    assert saved_png is not None
+    assert saved_small.read_bytes() == small.read_bytes()
+    with Image.open(saved_large) as out:
+        assert out.size == (300, 150)
+    with Image.open(saved_png) as out:
+        assert out.format == "JPEG"
+
+
+def test_transparent_png_flattened_on_white(tmp_path: Path) -> None:
+    src = tmp_path / "alpha.png"
+    Image.new("RGBA", (20, 20), (255, 0, 0, 0)).save(src)
+    gray = tmp_path / "gray.png"
+    Image.new("L", (20, 20), 128).save(gray)
+
+    compressor = ImageCompressor(max_largest_side=None, max_smallest_side=None)
+    saved, _ = compressor.compress_image(src, tmp_path / "alpha.jpg")
+    saved_gray, _ = compressor.compress_image(gray, tmp_path / "gray.jpg")
+
+    assert saved is not None
+    assert saved_gray is not None
+    with Image.open(saved) as out:
+        assert out.mode == "RGB"
+        assert all(channel > 250 for channel in out.getpixel((10, 10)))
+    with Image.open(saved_gray) as out:
+        assert out.mode == "L"
+
+
+def test_external_encoder_falls_back_to_pillow(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "img.png"
+    Image.new("RGB", (40, 20), "white").save(src)
+
+    def failing_encoder(*args, **kwargs):  # type: ignore[no-untyped-def]
+        raise FileNotFoundError("cwebp not found")
+
+    monkeypatch.setattr(image_compression, "CWEBP", "cwebp")
+    monkeypatch.setattr(image_compression, "save_webp_cwebp", failing_encoder)
+
+    compressor = ImageCompressor(output_format="WEBP", external_encoders=True)
+    saved, error = compressor.compress_image(src, tmp_path / "img.webp")
+
+    assert error is None
+    assert saved is not None
+    with Image.open(saved) as out:
+        assert out.format == "WEBP"
+
+
+def test_large_file_memory_mapped(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "img.png"
+    Image.new("RGB", (40, 20), "white").save(src)
+    monkeypatch.setattr(image_compression, "_MMAP_MIN_SIZE", 0)
+
+    with image_compression._open_source(src, src.stat().st_size) as img:
+        assert img.size == (40, 20)
+        assert img.filename == ""
+
+    stats: list[Path] = []
+    original_stat = Path.stat
+
+    def counting_stat(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+        if self == src:
+            stats.append(self)
+        return original_stat(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "stat", counting_stat)
+    saved, _, _, _, error = image_compression._compress_one(ImageCompressor(), src, tmp_path / "out" / "img.png", None)
+
+    assert error is None
+    assert saved == tmp_path / "out" / "img.jpg"
+    assert len(stats) == 1
+
+
+def test_exact_dct_scale_skips_resize(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "big.jpg"
+    Image.new("RGB", (1600, 800), "red").save(src)
+    factors = _record_reduce(monkeypatch)
+
+    def failing_resize(*args, **kwargs):  # type: ignore[no-untyped-def]
+        raise AssertionError("resize should not be called")
+
+    monkeypatch.setattr(Image.Image, "resize", failing_resize)
+
+    compressor = ImageCompressor(max_largest_side=200, max_smallest_side=None)
+    saved, error = compressor.compress_image(src, tmp_path / "out.jpg")
+
+    assert error is None
+    assert saved is not None
+    assert factors == []
+    with Image.open(saved) as out:
+        assert out.size == (200, 100)
+
+
+def test_prefetched_mapping_closed_after_use(tmp_path: Path) -> None:
+    src = tmp_path / "img.png"
+    Image.new("RGB", (40, 20), "white").save(src)
+
+    data = image_compression._prefetch(src)
+    assert data is not None
+    with image_compression._open_source(src, src.stat().st_size, data) as img:
+        assert img.size == (40, 20)
+
+    if isinstance(data, mmap.mmap):
+        assert data.closed
+
+
+def test_strip_metadata_applies_orientation(tmp_path: Path) -> None:
+    src = tmp_path / "rotated.jpg"
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Rotate 90° clockwise on display
+    exif[0x010F] = "Camera"
+    srgb = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+    Image.new("RGB", (40, 20), "red").save(src, exif=exif.tobytes(), icc_profile=srgb)
+
+    compressor = ImageCompressor(max_largest_side=None, max_smallest_side=None, strip_metadata=True)
+    saved, error = compressor.compress_image(src, tmp_path / "out.jpg")
+
+    assert error is None
+    assert saved is not None
+    with Image.open(saved) as out:
+        assert out.size == (20, 40)
+        assert "exif" not in out.info
+        assert "icc_profile" not in out.info
@@ -49,3 +49,19 @@ def test_unsupported_preserves_mtime(tmp_path: Path) -> None:
     copied = unsupported_dir / "note.txt"
     assert copied.exists()
     assert copied.stat().st_mtime_ns == orig_mtime
+
+
+def test_unsupported_copy_keeps_existing_files(tmp_path: Path) -> None:
+    input_dir = tmp_path / "input"
+    (input_dir / "sub").mkdir(parents=True)
+    (input_dir / "notes.txt").write_text("new")
+    (input_dir / "sub" / "notes.txt").write_text("nested")
+    unsupported_dir = tmp_path / "unsupported"
+    unsupported_dir.mkdir()
+    (unsupported_dir / "notes.txt").write_text("old")
+
+    compressor = ImageCompressor(preserve_structure=False, unsupported_dir=unsupported_dir)
+    compressor.process_directory(input_dir, tmp_path / "output")
+
+    assert sorted(p.name for p in unsupported_dir.iterdir()) == ["notes.txt", "notes_1.txt", "notes_2.txt"]
+    assert (unsupported_dir / "notes.txt").read_text() == "old"
@@ -3,6 +3,8 @@ from __future__ import annotations
 import os
 from pathlib import Path
 
+from PIL import Image
+
 from service.image_compression import ImageCompressor
 
 
@@ -27,3 +29,29 @@ def test_failed_file_copied_to_unsupported(tmp_path: Path) -> None:
     copied = unsupported_dir / "bad.jpg"
     assert copied.exists()
     assert copied.stat().st_mtime_ns == orig_mtime
+
+
+def test_failed_write_marks_only_that_file(tmp_path: Path, monkeypatch) -> None:
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    for name in ("good", "bad"):
+        Image.new("RGB", (10, 10), "red").save(input_dir / f"{name}.png")
+    output_dir = tmp_path / "out"
+    unsupported_dir = tmp_path / "unsupported"
+    original_write = Path.write_bytes
+
+    def failing_write(self: Path, data: bytes) -> int:
+        if self.name == "bad.jpg":
+            raise OSError("disk full")
+        return original_write(self, data)
+
+    monkeypatch.setattr(Path, "write_bytes", failing_write)
+
+    compressor = ImageCompressor(unsupported_dir=unsupported_dir)
+    total, compressed, paths, failed, results = compressor.process_directory(input_dir, output_dir, num_workers=1)
+
+    assert (total, compressed) == (2, 1)
+    assert paths == [output_dir / "good.jpg"]
+    assert [(path.name, error) for path, error in failed] == [("bad.png", "disk full")]
+    assert [src.name for src, *_ in results] == ["good.png"]
+    assert (unsupported_dir / "bad.png").exists()
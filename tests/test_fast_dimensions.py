@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from service import image_compression
+from service.compression_profiles import CompressionProfile
+from service.image_compression import ImageCompressor, _fast_dimensions
+
+
+@pytest.mark.parametrize(
+    ("name", "mode", "params", "image_format"),
+    [
+        ("img.jpg", "RGB", {}, "JPEG"),
+        ("progressive.jpg", "RGB", {"progressive": True}, "JPEG"),
+        ("img.png", "RGBA", {}, "PNG"),
+        ("lossy.webp", "RGB", {}, "WEBP"),
+        ("lossless.webp", "RGB", {"lossless": True}, "WEBP"),
+        ("alpha.webp", "RGBA", {}, "WEBP"),
+        ("img.bmp", "RGB", {}, "BMP"),
+    ],
+)
+def test_fast_dimensions_matches_pillow(tmp_path: Path, name: str, mode: str, params: dict, image_format: str) -> None:
+    path = tmp_path / name
+    Image.new(mode, (321, 123)).save(path, **params)
+    assert _fast_dimensions(path) == (image_format, (321, 123))
+
+
+def test_jpeg_dimensions_after_exif_segment(tmp_path: Path) -> None:
+    path = tmp_path / "exif.jpg"
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    Image.new("RGB", (64, 48)).save(path, exif=exif.tobytes())
+    assert _fast_dimensions(path) == ("JPEG", (64, 48))
+
+
+def test_should_compress_image(tmp_path: Path) -> None:
+    small = tmp_path / "small.jpg"
+    large = tmp_path / "large.jpg"
+    Image.new("RGB", (100, 50)).save(small)
+    Image.new("RGB", (400, 200)).save(large)
+
+    compressor = ImageCompressor(max_largest_side=300, max_smallest_side=None, skip_unchanged=True)
+    assert not compressor.should_compress_image(small)
+    assert compressor.should_compress_image(large)
+
+    compressor = ImageCompressor(max_largest_side=None, max_smallest_side=150, skip_unchanged=True)
+    assert not compressor.should_compress_image(small)
+    assert compressor.should_compress_image(large)
+
+    # The header decides, not the suffix
+    Image.new("RGB", (100, 50)).save(small, "PNG")
+    assert compressor.should_compress_image(small)
+
+
+def test_unchanged_images_kept_without_decoding(tmp_path: Path, monkeypatch) -> None:
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    Image.new("RGB", (100, 50), "green").save(input_dir / "small.jpg", quality=95)
+    Image.new("RGB", (400, 200), "green").save(input_dir / "large.jpg", quality=95)
+    opened: list[str] = []
+    original = image_compression._open_source
+
+    def recording_open(src, *args, **kwargs):  # type: ignore[no-untyped-def]
+        opened.append(src.name)
+        return original(src, *args, **kwargs)
+
+    monkeypatch.setattr(image_compression, "_open_source", recording_open)
+    compressor = ImageCompressor(max_largest_side=300, max_smallest_side=None, skip_unchanged=True)
+    _, _, paths, failed, _ = compressor.process_directory(input_dir, tmp_path / "out", num_workers=1)
+
+    assert failed == []
+    assert opened == ["large.jpg"]
+    assert sorted(p.name for p in paths) == ["large.jpg", "small.jpg"]
+    assert (tmp_path / "out" / "small.jpg").read_bytes() == (input_dir / "small.jpg").read_bytes()
+
+
+def test_should_compress_image_without_reading(tmp_path: Path) -> None:
+    missing_jpeg = tmp_path / "missing.jpg"
+    missing_png = tmp_path / "missing.png"
+
+    # Every image is re-encoded unless skip_unchanged is set
+    assert ImageCompressor().should_compress_image(missing_jpeg)
+    # A format change always requires encoding
+    assert ImageCompressor(skip_unchanged=True).should_compress_image(missing_png)
+
+
+def test_other_formats_not_probed_before_decoding(tmp_path: Path, monkeypatch) -> None:
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    Image.new("RGB", (100, 50), "green").save(input_dir / "small.png")
+    selected_from: list[type] = []
+    original = image_compression._select_profile
+
+    def recording_select(image, *args, **kwargs):  # type: ignore[no-untyped-def]
+        selected_from.append(type(image))
+        return original(image, *args, **kwargs)
+
+    monkeypatch.setattr(image_compression, "_select_profile", recording_select)
+    compressor = ImageCompressor(max_largest_side=300, max_smallest_side=None, skip_unchanged=True)
+    profiles = [CompressionProfile(name="Default", output_format="JPEG")]
+    _, _, paths, failed, _ = compressor.process_directory(input_dir, tmp_path / "out", profiles, num_workers=1)
+
+    assert failed == []
+    assert [p.name for p in paths] == ["small.jpg"]
+    # A PNG never stays a PNG, so the profile is selected from the decoded image
+    assert len(selected_from) == 1
+    assert not issubclass(selected_from[0], Path)
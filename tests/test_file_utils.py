@@ -0,0 +1,40 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from service.file_utils import copy_times_from_src, iter_files, lower_suffix
+
+
+def test_iter_files_walks_nested_dirs(tmp_path: Path) -> None:
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "top.jpg").write_bytes(b"")
+    (tmp_path / "a" / "mid.png").write_bytes(b"")
+    (tmp_path / "a" / "b" / "deep.txt").write_bytes(b"")
+
+    found = sorted(Path(entry.path).relative_to(tmp_path).as_posix() for entry in iter_files(tmp_path))
+
+    assert found == ["a/b/deep.txt", "a/mid.png", "top.jpg"]
+
+
+def test_iter_files_missing_root(tmp_path: Path) -> None:
+    assert list(iter_files(tmp_path / "missing")) == []
+
+
+@pytest.mark.parametrize("name", ["photo.JPG", "archive.tar.gz", ".hidden", "noext", "trailing.", "..jpg"])
+def test_lower_suffix_matches_pathlib(name: str) -> None:
+    assert lower_suffix(name) == Path(name).suffix.lower()
+
+
+def test_copy_times_from_entry_and_stat(tmp_path: Path) -> None:
+    src = tmp_path / "src.txt"
+    src.write_bytes(b"x")
+    os.utime(src, ns=(1_000_000_000, 2_000_000_000))
+    (entry,) = iter_files(tmp_path)
+
+    for source in (src, entry, src.stat()):
+        dst = tmp_path / "out" / "dst.txt"
+        dst.parent.mkdir(exist_ok=True)
+        dst.write_bytes(b"y")
+        copy_times_from_src(source, dst)
+        assert dst.stat().st_mtime_ns == 2_000_000_000
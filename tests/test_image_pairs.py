@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from service.image_compression import (
+    create_image_pairs,
+    load_compression_settings,
+    read_settings_file,
+    save_compression_settings,
+)
+
+
+def _touch(path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+    return path
+
+
+def test_create_image_pairs_matches_by_relative_stem(tmp_path: Path) -> None:
+    original = tmp_path / "original"
+    compressed = tmp_path / "compressed"
+    same = _touch(original / "a" / "same.jpg")
+    converted = _touch(original / "a" / "photo.png")
+    _touch(original / "notes.txt")
+    same_out = _touch(compressed / "a" / "same.jpg")
+    converted_out = _touch(compressed / "a" / "photo.webp")
+    orphan_out = _touch(compressed / "a" / "orphan.jpg")
+
+    pairs = create_image_pairs(compressed, original)
+
+    assert sorted(pairs) == sorted(
+        [
+            (same, same_out),
+            (converted, converted_out),
+            (orphan_out, orphan_out),
+        ]
+    )
+
+
+def test_create_image_pairs_flattened_output(tmp_path: Path) -> None:
+    original = tmp_path / "original"
+    compressed = tmp_path / "compressed"
+    nested = _touch(original / "x" / "y" / "img.png")
+    nested_out = _touch(compressed / "img.jpg")
+
+    assert create_image_pairs(compressed, original) == [(nested, nested_out)]
+
+
+def test_compression_settings_roundtrip(tmp_path: Path) -> None:
+    original = tmp_path / "оригинал.jpg"
+    compressed = tmp_path / "out" / "оригинал.jpg"
+    compressed.parent.mkdir()
+    pairs = [(original, compressed, "Default", {"Default": {"smallest_side": True}})]
+
+    settings_file = save_compression_settings(
+        compressed.parent,
+        {"quality": 80, "unsupported_dir": tmp_path},
+        pairs,
+        {"input_size_mb": 1.5},
+        failed_files=[(tmp_path / "bad.png", "broken")],
+    )
+
+    assert settings_file is not None
+    data = load_compression_settings(settings_file)
+    assert data is not None
+    assert data["compression_settings"] == {"quality": 80, "unsupported_dir": str(tmp_path)}
+    assert data["image_pairs"][0]["compressed_name"] == "оригинал.jpg"
+    assert data["image_pairs"][0]["conditions"] == {"Default": {"smallest_side": True}}
+    assert data["failed_files"] == [{"path": str(tmp_path / "bad.png"), "error": "broken"}]
+    assert data["total_pairs"] == 1
+
+
+def test_broken_settings_file(tmp_path: Path) -> None:
+    settings_file = tmp_path / "compression_settings.json"
+    settings_file.write_text("{not json", encoding="utf-8")
+
+    assert load_compression_settings(settings_file) is None
+    with pytest.raises(json.JSONDecodeError):
+        read_settings_file(settings_file)
@@ -6,6 +6,7 @@ from pathlib import Path
 
 import pytest
 from PIL import Image
+from PySide6.QtCore import QThreadPool
 from PySide6.QtWidgets import QApplication
 
 from service.image_compression import ImageCompressor
@@ -69,3 +70,42 @@ def test_auto_update_unsupported_directory_on_output_change(qapp: QApplication,
     assert second_unsup.parent == second_out.parent
     assert second_unsup.name.startswith(f"{second_out.name}_{tr('not_proceed')}")
     assert second_unsup != first_unsup
+
+
+def test_compressor_reused_between_runs(qapp: QApplication, tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr("service.main.QMessageBox.information", lambda *args: None)
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    Image.new("RGB", (10, 10)).save(input_dir / "a.jpg")
+    window = MainWindow()
+    window.input_directory = input_dir
+
+    compressors = []
+    for name in ("out1", "out2"):
+        window.output_dir_edit.setText(str(tmp_path / name))
+        window.start_compression()
+        assert window.compression_worker is not None
+        window.compression_worker.wait()
+        compressors.append(window.compression_worker.compressor)
+        qapp.processEvents()
+        assert (tmp_path / name / "a.jpg").exists()
+
+    assert compressors[0] is compressors[1]
+    window.close()
+    assert window._compressor is None
+    # Retire the idle pool thread before later tests run
+    QThreadPool.globalInstance().waitForDone()
+
+
+@pytest.mark.usefixtures("qapp")
+def test_log_lines_flushed_as_plain_paragraphs() -> None:
+    window = MainWindow()
+    window.log_message("a <b>")
+    window.log_message("second")
+    window._flush_log()
+    window.log_message("third")
+    window._flush_log()
+
+    lines = window.log_text.toPlainText().splitlines()
+    assert [line.split("] ", 1)[1] for line in lines] == ["a <b>", "second", "third"]
+    assert window.log_text.document().blockCount() == 3
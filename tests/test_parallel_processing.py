@@ -1,5 +1,5 @@
 import os
-from concurrent.futures import ThreadPoolExecutor as RealThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor as RealProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -30,13 +30,82 @@ def test_default_worker_count(tmp_path: Path, monkeypatch) -> None:
 
     called: dict[str, int] = {}
 
-    def recording_executor(max_workers: int, *args: Any, **kwargs: Any) -> RealThreadPoolExecutor:
+    def recording_executor(max_workers: int, *args: Any, **kwargs: Any) -> RealProcessPoolExecutor:
         called["max_workers"] = max_workers
-        return RealThreadPoolExecutor(max_workers, *args, **kwargs)
+        return RealProcessPoolExecutor(max_workers, *args, **kwargs)
 
-    monkeypatch.setattr(image_compression, "ThreadPoolExecutor", recording_executor)
+    monkeypatch.setattr(image_compression, "ProcessPoolExecutor", recording_executor)
 
     compressor = ImageCompressor()
     compressor.process_directory(input_dir, output_dir)
 
     assert called["max_workers"] == os.cpu_count()
+
+
+def test_process_directory_parallel_flattened_names(tmp_path: Path) -> None:
+    input_dir = tmp_path / "in"
+    (input_dir / "sub").mkdir(parents=True)
+    Image.new("RGB", (10, 10)).save(input_dir / "img.jpg")
+    Image.new("RGB", (10, 10)).save(input_dir / "sub" / "img.png")
+    output_dir = tmp_path / "out"
+    compressor = ImageCompressor(preserve_structure=False)
+    _, compressed, paths, failed, _ = compressor.process_directory(input_dir, output_dir, num_workers=2)
+    assert compressed == 2
+    assert failed == []
+    assert sorted(p.name for p in paths) == ["img.jpg", "img_1.jpg"]
+
+
+def test_process_directory_prefetch(tmp_path: Path) -> None:
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    for i in range(3):
+        Image.new("RGB", (10, 10)).save(input_dir / f"img{i}.png")
+    (input_dir / "broken.jpg").write_bytes(b"not an image")
+    output_dir = tmp_path / "out"
+    compressor = ImageCompressor(copy_unsupported=False)
+    total, compressed, _, failed, _ = compressor.process_directory(input_dir, output_dir, num_workers=1, prefetch=True)
+    assert total == 4
+    assert compressed == 3
+    assert [src.name for src, _ in failed] == ["broken.jpg"]
+    assert sorted(p.name for p in output_dir.iterdir()) == ["img0.jpg", "img1.jpg", "img2.jpg"]
+
+
+def test_worker_pool_reused_across_directories(tmp_path: Path, monkeypatch) -> None:
+    jobs = []
+    for name in ("a", "b"):
+        input_dir = tmp_path / name
+        input_dir.mkdir()
+        Image.new("RGB", (10, 10)).save(input_dir / "img.png")
+        jobs.append((input_dir, tmp_path / f"{name}_out"))
+
+    created: list[int] = []
+
+    def recording_executor(max_workers: int, *args: Any, **kwargs: Any) -> RealProcessPoolExecutor:
+        created.append(max_workers)
+        return RealProcessPoolExecutor(max_workers, *args, **kwargs)
+
+    monkeypatch.setattr(image_compression, "ProcessPoolExecutor", recording_executor)
+
+    with ImageCompressor(num_workers=2) as compressor:
+        results = compressor.process_directories(jobs)
+        assert compressor._pool is not None
+
+    assert compressor._pool is None
+    assert created == [2]
+    assert [compressed for _, compressed, _, _, _ in results] == [1, 1]
+
+
+def test_background_writer_keeps_mtime(tmp_path: Path) -> None:
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    src = input_dir / "img.png"
+    Image.new("RGB", (10, 10)).save(src)
+    os.utime(src, (1_700_000_000, 1_700_000_200))
+    output_dir = tmp_path / "out"
+
+    ImageCompressor().process_directory(input_dir, output_dir, num_workers=1)
+
+    saved = output_dir / "img.jpg"
+    with Image.open(saved) as img:
+        assert img.size == (10, 10)
+    assert saved.stat().st_mtime_ns == src.stat().st_mtime_ns
@@ -1,14 +1,20 @@
+import json
+import pickle
 from pathlib import Path
 
 from PIL import Image
 
+from service import compression_profiles
 from service.compression_profiles import (
     CompressionProfile,
     NumericCondition,
     ProfileConditions,
+    clear_image_cache,
     load_profiles,
     save_profiles,
     select_profile,
+    select_profiles_batch,
+    select_profiles_bulk,
 )
 
 
@@ -104,3 +110,306 @@ def test_profile_priority_loaded(tmp_path: Path) -> None:
     profile = select_profile(img, loaded)
     assert profile is not None
     assert profile.name == "bottom"
+
+
+def test_exif_not_read_without_exif_conditions(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "img.jpg"
+    Image.new("RGB", (40, 20)).save(src)
+
+    def failing_getexif(*args):  # type: ignore[no-untyped-def]
+        raise AssertionError("getexif should not be called")
+
+    monkeypatch.setattr(Image.Image, "getexif", failing_getexif)
+    profile = select_profile(src, [CompressionProfile(name="default")])
+    assert profile is not None
+    assert profile.name == "default"
+
+
+def test_required_exif_read_from_raw_ifd(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "img.png"
+    exif = Image.Exif()
+    exif[0x010F] = "Canon"
+    exif[0x0112] = 6
+    Image.new("RGB", (40, 20)).save(src, exif=exif.tobytes())
+
+    def failing_getexif(*args):  # type: ignore[no-untyped-def]
+        raise AssertionError("getexif should not be called")
+
+    monkeypatch.setattr(Image.Image, "getexif", failing_getexif)
+    profiles = [
+        CompressionProfile(name="default"),
+        CompressionProfile(
+            name="canon",
+            conditions=ProfileConditions(required_exif={"Make": "Canon", "Orientation": 6}),
+        ),
+        CompressionProfile(
+            name="nikon",
+            conditions=ProfileConditions(required_exif={"Make": "Nikon"}),
+        ),
+    ]
+    profile = select_profile(src, profiles)
+    assert profile is not None
+    assert profile.name == "canon"
+
+
+def test_input_formats_case_insensitive() -> None:
+    conditions = ProfileConditions(input_formats=["jpeg", "Png"])
+    assert conditions.matches(10, 10, image_format="PNG")
+    assert conditions.matches(10, 10, image_format="jpeg")
+    assert not conditions.matches(10, 10, image_format="WEBP")
+    assert not conditions.matches(10, 10)
+
+
+def test_numeric_condition_operators() -> None:
+    def side(op: str, value: float) -> ProfileConditions:
+        return ProfileConditions(smallest_side=NumericCondition(op=op, value=value))
+
+    assert side("<", 11).matches(10, 20)
+    assert not side("<", 10).matches(10, 20)
+    assert side("<=", 10).matches(10, 20)
+    assert side(">", 9).matches(10, 20)
+    assert side(">=", 10).matches(10, 20)
+    assert side("==", 10).matches(10, 20)
+    assert not side("!=", 10).matches(10, 20)
+
+
+def test_image_probe_cached_until_file_changes(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "img.png"
+    Image.new("RGB", (40, 20)).save(src)
+    opened: list[str] = []
+    original_open = Image.open
+
+    def recording_open(fp, *args, **kwargs):  # type: ignore[no-untyped-def]
+        opened.append(str(fp))
+        return original_open(fp, *args, **kwargs)
+
+    monkeypatch.setattr(compression_profiles.Image, "open", recording_open)
+    clear_image_cache()
+    profiles = [
+        CompressionProfile(name="default"),
+        CompressionProfile(name="portrait", conditions=ProfileConditions(orientation="portrait")),
+    ]
+
+    assert select_profile(src, profiles) is profiles[0]
+    assert select_profile(src, profiles) is profiles[0]
+    assert len(opened) == 1
+
+    Image.new("RGB", (20, 40)).save(src, compress_level=0)
+    assert select_profile(src, profiles) is profiles[1]
+    assert len(opened) == 2
+
+
+def test_matches_agrees_with_evaluate() -> None:
+    conditions = [
+        ProfileConditions(),
+        ProfileConditions(largest_side=NumericCondition(op=">", value=30), orientation="landscape"),
+        ProfileConditions(requires_transparency=True, input_formats=["png"]),
+        ProfileConditions(file_size=NumericCondition(op="<", value=100), required_exif={"Make": "Canon"}),
+    ]
+    cases = [
+        {"width": 40, "height": 20, "image_format": "PNG", "has_transparency": True, "file_size": 50},
+        {"width": 20, "height": 40, "image_format": "JPEG", "has_transparency": False, "exif": {"Make": "Canon"}},
+        {"width": 40, "height": 20, "file_size": 50, "exif": {"Make": "Canon"}},
+    ]
+    for cond in conditions:
+        for case in cases:
+            assert cond.matches(**case) == all(cond.evaluate(**case).values())
+
+
+def test_save_profiles_skips_unset_conditions(tmp_path: Path) -> None:
+    profiles = [
+        CompressionProfile(
+            name="small",
+            advanced_params={"progressive": True},
+            conditions=ProfileConditions(smallest_side=NumericCondition(op="<", value=500), input_formats=["png"]),
+        )
+    ]
+    file_path = save_profiles(profiles, tmp_path / "profiles.json", pretty=False)
+
+    data = json.loads(file_path.read_text(encoding="utf-8"))
+    assert data[0]["conditions"] == {"smallest_side": {"op": "<", "value": 500}, "input_formats": ["png"]}
+    assert "\n" not in file_path.read_text(encoding="utf-8")
+    assert load_profiles(file_path) == profiles
+
+
+def test_compiled_conditions_follow_assignment_and_pickle() -> None:
+    conditions = ProfileConditions(orientation="portrait", input_formats=["png"])
+    assert conditions.matches(10, 20, image_format="png")
+
+    conditions.orientation = "landscape"
+    assert not conditions.matches(10, 20, image_format="png")
+
+    restored = pickle.loads(pickle.dumps(conditions))
+    assert restored == conditions
+    assert restored.matches(20, 10, image_format="PNG")
+
+
+def test_transparency_detected_from_mode_and_info() -> None:
+    profiles = [
+        CompressionProfile(name="opaque"),
+        CompressionProfile(name="alpha", conditions=ProfileConditions(requires_transparency=True)),
+    ]
+    paletted = Image.new("P", (4, 4))
+    paletted.info["transparency"] = 0
+    images = {
+        "RGB": Image.new("RGB", (4, 4)),
+        "RGBA": Image.new("RGBA", (4, 4)),
+        "LA": Image.new("LA", (4, 4)),
+        "P+tRNS": paletted,
+        "PA": Image.new("PA", (4, 4)),
+        "La": Image.new("La", (4, 4)),
+    }
+    selected = {}
+    for name, img in images.items():
+        profile = select_profile(img, profiles)
+        assert profile is not None
+        selected[name] = profile.name
+    assert selected == {
+        "RGB": "opaque",
+        "RGBA": "alpha",
+        "LA": "alpha",
+        "P+tRNS": "alpha",
+        "PA": "alpha",
+        "La": "alpha",
+    }
+
+
+def test_condition_results_select_last_match() -> None:
+    profiles = [
+        CompressionProfile(name="default"),
+        CompressionProfile(name="landscape", conditions=ProfileConditions(orientation="landscape")),
+        CompressionProfile(name="portrait", conditions=ProfileConditions(orientation="portrait")),
+    ]
+    profile, results = select_profile(Image.new("RGB", (40, 20)), profiles, return_condition_results=True)
+    assert profile is profiles[1]
+    assert results == {"default": {}, "landscape": {"orientation": True}, "portrait": {"orientation": False}}
+
+
+def test_required_exif_falls_back_to_pillow(tmp_path: Path) -> None:
+    src = tmp_path / "img.png"
+    exif = Image.Exif()
+    exif[0x010F] = "Canon"
+    exif[0x011A] = 72.0  # XResolution is a RATIONAL, not decoded by the fast path
+    Image.new("RGB", (40, 20)).save(src, exif=exif.tobytes())
+    profiles = [
+        CompressionProfile(name="default"),
+        CompressionProfile(
+            name="canon",
+            conditions=ProfileConditions(required_exif={"Make": "Canon", "XResolution": 72}),
+        ),
+    ]
+    profile = select_profile(src, profiles)
+    assert profile is not None
+    assert profile.name == "canon"
+
+
+def test_file_size_condition_for_opened_images(tmp_path: Path) -> None:
+    src = tmp_path / "img.png"
+    Image.new("RGB", (40, 20)).save(src)
+    profiles = [
+        CompressionProfile(name="default"),
+        CompressionProfile(
+            name="small_file",
+            conditions=ProfileConditions(file_size=NumericCondition(op="<", value=10_000)),
+        ),
+    ]
+    with Image.open(src) as img:
+        assert select_profile(img, profiles) is profiles[1]
+    assert select_profile(Image.new("RGB", (40, 20)), profiles) is profiles[0]
+    assert select_profile(Image.new("RGB", (40, 20)), profiles, file_size=20_000) is profiles[0]
+    assert select_profile(Image.new("RGB", (40, 20)), profiles, file_size=500) is profiles[1]
+
+
+def test_missing_path_selects_nothing(tmp_path: Path) -> None:
+    profiles = [CompressionProfile(name="default")]
+    assert select_profile(tmp_path / "missing.jpg", profiles) is None
+    assert select_profile(tmp_path / "missing.jpg", profiles, return_condition_results=True) == (None, {})
+
+
+def test_select_profiles_bulk(tmp_path: Path) -> None:
+    paths = []
+    for i, size in enumerate([(40, 20), (20, 40), (30, 30)]):
+        path = tmp_path / f"{i}.png"
+        Image.new("RGB", size).save(path)
+        paths.append(path)
+    profiles = [
+        CompressionProfile(name="default"),
+        CompressionProfile(name="portrait", conditions=ProfileConditions(orientation="portrait")),
+    ]
+    selected = select_profiles_bulk([*paths, tmp_path / "missing.png"], profiles, max_workers=2)
+    assert selected == [profiles[0], profiles[1], profiles[0], None]
+
+
+def test_required_exif_by_tag_id(tmp_path: Path) -> None:
+    src = tmp_path / "img.png"
+    exif = Image.Exif()
+    exif[0x010F] = "Canon"
+    Image.new("RGB", (40, 20)).save(src, exif=exif.tobytes())
+    profiles = [
+        CompressionProfile(name="default"),
+        CompressionProfile(name="by_id", conditions=ProfileConditions(required_exif={"271": "Canon"})),
+        CompressionProfile(name="both", conditions=ProfileConditions(required_exif={"271": "Canon", "Make": "Canon"})),
+    ]
+    with Image.open(src) as img:
+        profile, results = select_profile(img, profiles, return_condition_results=True)
+    assert profile is profiles[2]
+    assert results["by_id"] == {"required_exif": True}
+
+
+def test_load_profiles_normalises_case(tmp_path: Path) -> None:
+    file_path = tmp_path / "profiles.json"
+    data = [{"name": "p", "output_format": "WebP", "conditions": {"orientation": "Portrait"}}]
+    file_path.write_text(json.dumps(data), encoding="utf-8")
+
+    (profile,) = load_profiles(file_path)
+    assert profile.output_format == "WEBP"
+    assert profile.conditions.orientation == "portrait"
+
+
+def test_select_profiles_batch_matches_select_profile(tmp_path: Path) -> None:
+    paths: list[Path | str] = []
+    for i, (size, mode) in enumerate([((40, 20), "RGB"), ((20, 40), "RGBA"), ((300, 300), "RGB"), ((10, 60), "RGB")]):
+        path = tmp_path / f"{i}.png"
+        Image.new(mode, size).save(path)
+        paths.append(path)
+    paths.append(tmp_path / "missing.png")
+    profiles = [
+        CompressionProfile(name="default"),
+        CompressionProfile(name="alpha", conditions=ProfileConditions(requires_transparency=True)),
+        CompressionProfile(
+            name="big_square",
+            conditions=ProfileConditions(
+                smallest_side=NumericCondition(op=">=", value=200), orientation="square", input_formats=["png"]
+            ),
+        ),
+        CompressionProfile(
+            name="tall",
+            conditions=ProfileConditions(aspect_ratio=NumericCondition(op="<", value=0.5)),
+        ),
+    ]
+    expected = [select_profile(path, profiles) for path in paths]
+    assert [p.name if p else None for p in expected] == ["default", "alpha", "big_square", "tall", None]
+    assert select_profiles_batch(paths, profiles) == expected
+    assert select_profiles_batch(paths, []) == [None] * len(paths)
+
+
+def test_exif_read_only_when_a_profile_reaches_it(monkeypatch) -> None:
+    calls: list[frozenset[str]] = []
+    original = compression_profiles._image_exif
+
+    def recording_image_exif(img, keys):  # type: ignore[no-untyped-def]
+        calls.append(keys)
+        return original(img, keys)
+
+    monkeypatch.setattr(compression_profiles, "_image_exif", recording_image_exif)
+    profiles = [
+        CompressionProfile(name="default"),
+        CompressionProfile(
+            name="canon_portrait",
+            conditions=ProfileConditions(orientation="portrait", required_exif={"Make": "Canon"}),
+        ),
+    ]
+    assert select_profile(Image.new("RGB", (40, 20)), profiles) is profiles[0]
+    assert calls == []
+    assert select_profile(Image.new("RGB", (20, 40)), profiles) is profiles[0]
+    assert calls == [frozenset({"Make"})]
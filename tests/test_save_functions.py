@@ -0,0 +1,69 @@
+import io
+import sys
+from pathlib import Path
+
+from PIL import Image
+
+from service import save_functions
+from service.save_functions import _insert_jpeg_segments, save_avif, save_jpeg
+
+
+def test_insert_jpeg_segments_keeps_metadata() -> None:
+    buffer = io.BytesIO()
+    Image.new("RGB", (16, 16), "red").save(buffer, format="JPEG")
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    icc = bytes(range(256)) * 300  # Larger than one APP2 segment
+
+    data = _insert_jpeg_segments(buffer.getvalue(), exif=exif.tobytes(), icc_profile=icc, xmp=b"<x/>")
+
+    with Image.open(io.BytesIO(data)) as img:
+        assert img.getexif()[0x010F] == "Camera"
+        assert img.info["icc_profile"] == icc
+        assert img.info["xmp"] == b"<x/>"
+        img.load()
+
+
+def test_save_jpeg_keeps_exif(tmp_path: Path) -> None:
+    src = Image.new("RGB", (16, 16), "red")
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    src.info["exif"] = exif.tobytes()
+
+    save_jpeg(src, tmp_path / "out.jpg", quality=80)
+
+    with Image.open(tmp_path / "out.jpg") as img:
+        assert img.getexif()[0x010F] == "Camera"
+
+
+def test_save_avif_prefers_svt_when_available(monkeypatch) -> None:
+    codecs: list[str] = []
+
+    def recording_save(*args, **params):  # type: ignore[no-untyped-def]
+        codecs.append(params["codec"])
+
+    monkeypatch.setattr(save_functions, "_avif_codec_available", lambda codec: codec == "svt")
+    monkeypatch.setattr(Image.Image, "save", recording_save)
+
+    save_avif(Image.new("RGB", (128, 128)), io.BytesIO())
+    save_avif(Image.new("RGBA", (128, 128)), io.BytesIO())
+    save_avif(Image.new("RGB", (128, 128)), io.BytesIO(), subsampling="4:4:4")
+    save_avif(Image.new("RGB", (128, 128)), io.BytesIO(), codec="aom")
+
+    assert codecs == ["svt", "auto", "auto", "aom"]
+
+
+def test_external_encoder_keeps_palette_alpha_without_transparency_data(tmp_path: Path, monkeypatch) -> None:
+    # Pillow-SIMD builds before 10.1 have no Image.has_transparency_data
+    monkeypatch.delattr(Image.Image, "has_transparency_data")
+    src = Image.new("P", (8, 8))
+    src.info["transparency"] = 0
+    dst = tmp_path / "out.png"
+
+    def copy_cmd(png: Path) -> list[str]:
+        return [sys.executable, "-c", "import shutil, sys; shutil.copy(*sys.argv[1:])", str(png), str(dst)]
+
+    save_functions._run_with_png(src, dst, copy_cmd)
+
+    with Image.open(dst) as img:
+        assert img.mode == "RGBA"
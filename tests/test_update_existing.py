@@ -0,0 +1,105 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from service.image_compression import (
+    ImageCompressor,
+    previous_outputs,
+    save_compression_settings,
+)
+
+
+def _run(
+    input_dir: Path,
+    output_dir: Path,
+    settings: dict,
+    reuse: dict | None = None,
+    preserve_structure: bool = True,
+) -> list[Path]:
+    compressor = ImageCompressor(copy_unsupported=True, preserve_structure=preserve_structure)
+    copied: list[tuple[Path, Path]] = []
+    _, _, paths, failed, results = compressor.process_directory(
+        input_dir, output_dir, num_workers=1, reuse=reuse, copied_files=copied
+    )
+    save_compression_settings(output_dir, settings, results, {}, failed, copied_files=copied)
+    return paths
+
+
+def test_update_existing_skips_unchanged(tmp_path: Path, monkeypatch) -> None:
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    for name in ("a", "b"):
+        Image.new("RGB", (10, 10), "red").save(input_dir / f"{name}.png")
+    (input_dir / "note.txt").write_text("hello", encoding="utf-8")
+    output_dir = tmp_path / "out"
+    settings = {"input_directory": str(input_dir), "quality": 80}
+    _run(input_dir, output_dir, settings)
+
+    Image.new("RGB", (10, 10), "blue").save(input_dir / "b.png")
+    os.utime(input_dir / "b.png", ns=(1_700_000_000_000_000_000, 1_700_000_000_000_000_000))
+    encoded: list[str] = []
+    original = ImageCompressor.compress_image
+
+    def recording_compress(self, input_path, *args, **kwargs):  # type: ignore[no-untyped-def]
+        encoded.append(input_path.name)
+        return original(self, input_path, *args, **kwargs)
+
+    monkeypatch.setattr(ImageCompressor, "compress_image", recording_compress)
+    paths = _run(input_dir, output_dir, settings, previous_outputs(output_dir, settings))
+
+    assert encoded == ["b.png"]
+    assert sorted(p.name for p in paths) == ["a.jpg", "b.jpg"]
+    assert sorted(p.name for p in output_dir.iterdir()) == ["a.jpg", "b.jpg", "compression_settings.json", "note.txt"]
+
+    # Changed settings invalidate every previous output
+    assert previous_outputs(output_dir, {**settings, "quality": 50}) == {}
+
+
+def test_update_existing_flattened_replaces_copies(tmp_path: Path) -> None:
+    input_dir = tmp_path / "in"
+    for name in ("a", "b"):
+        (input_dir / name).mkdir(parents=True)
+        (input_dir / name / "notes.txt").write_text(name, encoding="utf-8")
+    (input_dir / "n.txt").write_text("old", encoding="utf-8")
+    Image.new("RGB", (10, 10), "red").save(input_dir / "c.png")
+    output_dir = tmp_path / "out"
+    settings = {"input_directory": str(input_dir)}
+    _run(input_dir, output_dir, settings, preserve_structure=False)
+    first = {c["original"]: c["copied"] for c in _copies(output_dir)}
+
+    (input_dir / "n.txt").write_text("new", encoding="utf-8")
+    # A source that no longer decodes is copied instead of its stale JPEG
+    (input_dir / "c.png").write_bytes(b"broken")
+    for _ in range(3):
+        _run(input_dir, output_dir, settings, previous_outputs(output_dir, settings), preserve_structure=False)
+
+    assert {c["original"]: c["copied"] for c in _copies(output_dir)} == {
+        **first,
+        str(input_dir / "c.png"): str(output_dir / "c.png"),
+    }
+    assert sorted(p.name for p in output_dir.iterdir()) == [
+        "c.png",
+        "compression_settings.json",
+        "n.txt",
+        "notes.txt",
+        "notes_1.txt",
+    ]
+    assert (output_dir / "n.txt").read_text(encoding="utf-8") == "new"
+
+
+def _copies(output_dir: Path) -> list[dict]:
+    return json.loads((output_dir / "compression_settings.json").read_text(encoding="utf-8"))["copied_files"]
+
+
+def test_existing_output_rejected_without_reuse(tmp_path: Path) -> None:
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    assert previous_outputs(output_dir, {}) == {}
+    with pytest.raises(FileExistsError):
+        ImageCompressor().process_directory(input_dir, output_dir)